@@ -4,6 +4,8 @@ from flask import Flask, render_template
 import google.genai as genai
 import secrets
 
+import modules.bd_operator as bo
+
 # Import the Blueprint
 from blueprints.viewer import viewer_bp
 from blueprints.manual_search import manualsearch_bp
@@ -26,6 +28,11 @@ def create_app():
     client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
     app.config['GENAI_CLIENT'] = client
 
+    # 検索結果DBの初期化 (未登録の結果JSONを取り込む)
+    bo.init_db(app)
+    with app.app_context():
+        bo.sync_archives(bo.RESULTS_DIR)
+
     # トップページをビューにリダイレクト
     @app.route('/')
     def index():
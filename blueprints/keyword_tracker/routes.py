@@ -1,11 +1,11 @@
 from flask import Blueprint, render_template, request
-from modules.pubmed_operator import fetch_weekly_counts
+from modules.pubmed_operator import fetch_weekly_counts_multi
 from . import ktracker_bp  
 
 @ktracker_bp.route('/weekly_graph', methods=['GET', 'POST'])
 def weekly_graph():
     labels = []
-    values = []
+    series = []
     keywords_str = "" 
     weeks = 8 
 
@@ -15,17 +15,25 @@ def weekly_graph():
 
         #print(f"Received keywords: {keywords_str}, weeks: {weeks}")
 
-        keywords = [k.strip() for k in keywords_str.split() if k]
+        # ";" 区切りで複数系列、各系列内はスペース区切りのキーワード
+        keyword_sets = [
+            [k.strip() for k in group.split() if k]
+            for group in keywords_str.split(';')
+        ]
+        keyword_sets = [ks for ks in keyword_sets if ks]
 
-        if keywords:
-            data = fetch_weekly_counts(keywords, weeks)
-            labels = list(data.keys())
-            values = list(data.values())
+        if keyword_sets:
+            data = fetch_weekly_counts_multi(keyword_sets, weeks)
+            labels = list(data[0].keys())
+            series = [
+                {"label": " ".join(ks), "values": list(counts.values())}
+                for ks, counts in zip(keyword_sets, data)
+            ]
 
     return render_template(
         'keywords.html', 
         labels=labels,
-        values=values, 
+        series=series, 
         keywords_str=keywords_str,
         weeks=weeks
-        )
\ No newline at end of file
+        )
@@ -1,21 +1,29 @@
-function drawTrendChart(labels, values, keywordLabel) {
+// 系列ごとの線の色 (先頭は従来のグリーン)
+const SERIES_COLORS = ["#2e7d32", "#1565c0", "#c62828", "#ef6c00", "#6a1b9a", "#00838f"];
+
+function drawTrendChart(labels, series) {
     const ctx = document.getElementById("weeklyChart").getContext("2d");
 
+    const datasets = series.map((s, i) => {
+        const color = SERIES_COLORS[i % SERIES_COLORS.length];
+        return {
+            label: `検索キーワード：${s.label}`,
+            data: s.values,
+            borderWidth: 3,
+            tension: 0.25,
+            borderColor: color,
+            backgroundColor: color + "26",
+            pointRadius: 4,
+            pointBackgroundColor: color,
+            pointBorderColor: "#fff"
+        };
+    });
+
     new Chart(ctx, {
         type: "line",
         data: {
             labels: labels,
-            datasets: [{
-                label: `検索キーワード：${keywordLabel}`,
-                data: values,
-                borderWidth: 3,
-                tension: 0.25,
-                borderColor: "#2e7d32",
-                backgroundColor: "rgba(46, 125, 50, 0.15)",
-                pointRadius: 4,
-                pointBackgroundColor: "#1b5e20",
-                pointBorderColor: "#fff"
-            }]
+            datasets: datasets
         },
         options: {
             responsive: true,
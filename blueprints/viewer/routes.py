@@ -1,64 +1,106 @@
 from flask import render_template, url_for, abort, flash, redirect
-from flask import current_app, request
+from flask import current_app, request, jsonify
 from pathlib import Path
-import json
-import re
-from datetime import datetime
+import sys
+
+# Import modules
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT))
+import modules.bd_operator as bo
+from modules.archive_catalog import get_archive_catalog
+from modules.result_archive import iter_archive_paths
 
 from . import viewer_bp
 
+# 検索ブロックの論文一覧の1ページあたりの件数 (デフォルト / 上限)
+PAPERS_PER_PAGE = 20
+PAPERS_MAX_PER_PAGE = 100
+
+# 全文検索の1ページあたりの件数 (デフォルト / 上限)
+SEARCH_PER_PAGE = 20
+SEARCH_MAX_PER_PAGE = 100
+
 @viewer_bp.route('/')
 def view_page():
-    results_dir = Path(current_app.root_path) / "search_result"
+    # --- アーカイブ一覧（カタログはディレクトリが変わったときだけ更新） ---
+    catalog = get_archive_catalog()
+    changed = catalog.refresh()
+    if changed:
+        bo.sync_archives(paths=changed)
 
-    # --- ファイル一覧取得（YYYY-MM-DD-YYYY-MM-DD.json形式のみ） ---
-    pattern = re.compile(r"(\d{4}-\d{2}-\d{2})-(\d{4}-\d{2}-\d{2})\.json$")
-    json_files = []
-
-    for f in results_dir.glob("*.json"):
-        match = pattern.search(f.name)
-        if match:
-            start_date = match.group(1)
-            end_date = match.group(2)
-            json_files.append({
-                "path": f,
-                "name": f.name,
-                "start_date": start_date,
-                "end_date": end_date,
-                "end_dt": datetime.strptime(end_date, "%Y-%m-%d")
-            })
-
-    if not json_files:
+    archives = catalog.entries()
+    if not archives:
         return "No result files found.", 404
 
     # --- URL パラメータ file=xxx.json を取得 ---
     requested_file = request.args.get("file")
 
     if requested_file:
-        # 指定ファイルが存在するかチェック
-        matched = next((f for f in json_files if f["name"] == requested_file), None)
-        if not matched:
+        # 指定ファイルがカタログに存在するかチェック
+        target = catalog.get(requested_file)
+        if target is None:
             return abort(404, description="Requested file not found.")
-        target_file = matched
     else:
-        # file がない → 最新のファイルを使用
-        target_file = max(json_files, key=lambda x: x["end_dt"])
+        # file がない → 終了日が最新のファイルを使用
+        target = archives[0]
 
-    # --- JSON内容を読み込み ---
-    try:
-        with open(target_file["path"], "r", encoding="utf-8") as f:
-            results = json.load(f)
-    except Exception:
-        return abort(500, description="Failed to read JSON file.")
+    # --- 検索ブロックの一覧のみ渡す（論文は viewer.js が API からページ単位で取得） ---
+    searches = bo.list_searches(target["period"])
 
     # --- テンプレートへ渡す ---
     return render_template(
         "view_results.html",
-        results=results,
-        archive_files=[f["name"] for f in json_files],
-        current_file=target_file["name"]
+        searches=searches,
+        archives=archives,
+        current_file=target["name"],
+        papers_per_page=PAPERS_PER_PAGE
     )
 
+@viewer_bp.route("/api/archives/<name>/searches")
+def archive_searches_api(name):
+    """アーカイブ (結果ファイル) の検索ブロックの一覧を JSON で返す"""
+    archive = get_archive_catalog().get(name)
+    if archive is None:
+        return jsonify({"error": "archive not found"}), 404
+    return jsonify({"archive": name, "searches": bo.list_searches(archive["period"])})
+
+@viewer_bp.route("/api/searches/<int:search_id>/papers")
+def search_papers_api(search_id):
+    """検索ブロックの論文を順位順に1ページ分 JSON で返す (アブストラクトは含めない)
+
+    Query Params:
+        page (int): ページ番号 (1始まり)
+        per_page (int): 1ページあたりの件数 (最大 PAPERS_MAX_PER_PAGE)
+    """
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = min(max(request.args.get("per_page", PAPERS_PER_PAGE, type=int), 1), PAPERS_MAX_PER_PAGE)
+    papers = bo.load_search_papers(search_id, page=page, per_page=per_page)
+    if papers is None:
+        return jsonify({"error": "search not found"}), 404
+    return jsonify(papers)
+
+@viewer_bp.route("/api/papers/<pmid>/abstract")
+def paper_abstract_api(pmid):
+    """論文のアブストラクトを JSON で返す"""
+    abstract = bo.load_abstract(pmid)
+    if abstract is None:
+        return jsonify({"error": "paper not found"}), 404
+    return jsonify({"pmid": pmid, "abstract": abstract})
+
+@viewer_bp.route("/search")
+def search():
+    """保存済みの論文を全文検索し、関連度順に1ページ分を JSON で返す
+
+    Query Params:
+        q (str): 検索語 (空白区切りで AND)
+        page (int): ページ番号 (1始まり)
+        per_page (int): 1ページあたりの件数 (最大 SEARCH_MAX_PER_PAGE)
+    """
+    query = request.args.get("q", "").strip()
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = min(max(request.args.get("per_page", SEARCH_PER_PAGE, type=int), 1), SEARCH_MAX_PER_PAGE)
+    return jsonify(bo.search_papers(query, page=page, per_page=per_page))
+
 @viewer_bp.route("/clear_archives", methods=["POST"])
 def clear_archives():
     results_dir = Path(current_app.root_path) / "search_result"
@@ -67,9 +109,10 @@ def clear_archives():
         abort(404, description="(clear_archives)search_result directory not found.")
 
     deleted = 0
-    for f in results_dir.glob("*.json"):
+    for f in iter_archive_paths(results_dir, unique=False):
         f.unlink()
         deleted += 1
+    bo.clear_results()
 
     flash(f"Archive cleared ({deleted} files deleted).", "info")
-    return redirect(url_for("viewer.view_page"))
\ No newline at end of file
+    return redirect(url_for("viewer.view_page"))
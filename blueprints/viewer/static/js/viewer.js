@@ -1,15 +1,18 @@
 document.addEventListener("DOMContentLoaded", () => {
-    // HTML に埋め込んだ JSON を取得
-    const jsonText = document.getElementById("resultsData").textContent;
-    const results = JSON.parse(jsonText);
+    // HTML に埋め込んだ検索ブロックの一覧 (論文は API からページ単位で取得する)
+    const jsonText = document.getElementById("searchesData").textContent;
+    const searches = JSON.parse(jsonText);
 
     const resultsArea = document.getElementById("resultsArea");
+    const sentinel = document.getElementById("resultsSentinel");
+    const apiUrl = resultsArea.dataset.apiUrl;
+    const perPage = resultsArea.dataset.perPage;
 
     // 安全に値を取得するヘルパー
     const safe = (value) => value || "記載なし";
 
-    results.forEach(result => {
-        // ===== 検索結果カード =====
+    // ===== 検索結果カード =====
+    const renderSearch = (result) => {
         const searchCard = document.createElement("div");
         searchCard.classList.add("card", "search-card", "mb-4", "p-3");
 
@@ -19,13 +22,17 @@ document.addEventListener("DOMContentLoaded", () => {
 <p><strong>Paper Count:</strong> ${result.paper_count}</p>`;
 
         const papersContainer = document.createElement("div");
+        searchCard.appendChild(papersContainer);
+        resultsArea.appendChild(searchCard);
+        return papersContainer;
+    };
 
-        // ===== 論文カード一覧 =====
-        result.papers.forEach(paper => {
-            const paperCard = document.createElement("div");
-            paperCard.classList.add("card", "paper-card", "mb-3", "p-3");
+    // ===== 論文カード =====
+    const renderPaper = (paper) => {
+        const paperCard = document.createElement("div");
+        paperCard.classList.add("card", "paper-card", "mb-3", "p-3");
 
-            paperCard.innerHTML = `<h6 class="paper-title">
+        paperCard.innerHTML = `<h6 class="paper-title">
 <a href="${paper.url}" target="_blank" class="text-prewrap paper-title-link">${paper.title.trim()}</a>
 </h6>
 <p><strong>PubDate:</strong> ${safe(paper.pubdate)}</p>
@@ -38,10 +45,198 @@ document.addEventListener("DOMContentLoaded", () => {
 <li><p><strong>解析手法:</strong> ${safe(paper.summary["解析手法"])}</p></li>
 </ul>`;
 
-            papersContainer.appendChild(paperCard);
+        // アブストラクトは表示するときに取得する
+        const abstractButton = document.createElement("button");
+        abstractButton.classList.add("btn", "btn-link", "btn-sm", "p-0", "mt-2", "text-start");
+        abstractButton.textContent = "Abstract を表示";
+        const abstractText = document.createElement("p");
+        abstractText.classList.add("text-prewrap", "d-none", "mt-2");
+
+        abstractButton.addEventListener("click", async () => {
+            if (!abstractText.dataset.loaded) {
+                abstractButton.disabled = true;
+                try {
+                    const response = await fetch(`${apiUrl}/papers/${encodeURIComponent(paper.pmid)}/abstract`);
+                    if (!response.ok) {
+                        throw new Error(`HTTP ${response.status}`);
+                    }
+                    const data = await response.json();
+                    abstractText.textContent = safe(data.abstract);
+                    abstractText.dataset.loaded = "true";
+                } catch (error) {
+                    abstractButton.textContent = "Abstract を表示 (読み込みに失敗しました。クリックで再試行)";
+                    return;
+                } finally {
+                    abstractButton.disabled = false;
+                }
+            }
+            const hidden = abstractText.classList.toggle("d-none");
+            abstractButton.textContent = hidden ? "Abstract を表示" : "Abstract を閉じる";
         });
 
-        searchCard.appendChild(papersContainer);
-        resultsArea.appendChild(searchCard);
+        paperCard.append(abstractButton, abstractText);
+        return paperCard;
+    };
+
+    // ===== 無限スクロール: 末尾が見えたら次のページを取得する =====
+    let searchIndex = 0;
+    let page = 0;
+    let container = null;
+    let renderedIndex = -1;  // 検索カードを表示済みの検索ブロック (ページ取得の失敗・再試行で二重に表示しない)
+    let loading = false;
+
+    const loadNext = async () => {
+        if (loading || searchIndex >= searches.length) {
+            return;
+        }
+        loading = true;
+        sentinel.textContent = "読み込み中...";
+
+        const search = searches[searchIndex];
+        if (renderedIndex !== searchIndex) {
+            container = renderSearch(search);
+            renderedIndex = searchIndex;
+        }
+        page += 1;
+
+        try {
+            const params = new URLSearchParams({ page, per_page: perPage });
+            const response = await fetch(`${apiUrl}/searches/${search.id}/papers?${params}`);
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            const data = await response.json();
+            data.papers.forEach(paper => container.appendChild(renderPaper(paper)));
+
+            // 検索ブロックの論文をすべて表示したら次の検索ブロックへ
+            if (!data.has_more) {
+                searchIndex += 1;
+                page = 0;
+            }
+            sentinel.textContent = "";
+        } catch (error) {
+            page -= 1;
+            sentinel.textContent = "読み込みに失敗しました。スクロールで再試行します。";
+            return;
+        } finally {
+            loading = false;
+        }
+
+        // 画面が埋まっていなければ続けて取得する
+        if (isVisible(sentinel)) {
+            loadNext();
+        }
+    };
+
+    const isVisible = (element) => {
+        const rect = element.getBoundingClientRect();
+        return rect.top < window.innerHeight + 400 && !resultsArea.classList.contains("d-none");
+    };
+
+    const observer = new IntersectionObserver((entries) => {
+        if (entries.some(entry => entry.isIntersecting) && !resultsArea.classList.contains("d-none")) {
+            loadNext();
+        }
+    }, { rootMargin: "400px 0px" });
+    observer.observe(sentinel);
+});
+
+// ===== 全文検索 =====
+document.addEventListener("DOMContentLoaded", () => {
+    const form = document.getElementById("searchForm");
+    const input = document.getElementById("searchQuery");
+    const searchArea = document.getElementById("searchArea");
+    const resultsArea = document.getElementById("resultsArea");
+    const archiveUrl = form.dataset.archiveUrl;
+
+    let query = "";
+    let page = 0;
+
+    // 検索結果の表示をやめてアーカイブ表示に戻す
+    const closeSearch = () => {
+        searchArea.classList.add("d-none");
+        searchArea.innerHTML = "";
+        resultsArea.classList.remove("d-none");
+    };
+
+    // 論文1件分のカード
+    const renderHit = (hit) => {
+        const card = document.createElement("div");
+        card.classList.add("card", "paper-card", "mb-3", "p-3");
+
+        const title = document.createElement("h6");
+        title.classList.add("paper-title");
+        const link = document.createElement("a");
+        link.href = hit.url || "#";
+        link.target = "_blank";
+        link.classList.add("text-prewrap", "paper-title-link");
+        link.textContent = (hit.title || "").trim();
+        title.appendChild(link);
+
+        const meta = document.createElement("p");
+        meta.innerHTML = "<strong>PubDate:</strong> ";
+        meta.append(hit.pubdate || "記載なし");
+
+        const snippet = document.createElement("p");
+        snippet.innerHTML = hit.snippet_html;  // サーバー側でエスケープ済み (<mark> のみ)
+
+        const periods = document.createElement("p");
+        periods.innerHTML = "<strong>Archives:</strong> ";
+        hit.search_periods.forEach(period => {
+            const a = document.createElement("a");
+            a.href = `${archiveUrl}?file=${period}.json`;
+            a.textContent = period;
+            a.classList.add("me-2");
+            periods.appendChild(a);
+        });
+
+        card.append(title, meta, snippet, periods);
+        return card;
+    };
+
+    // 次のページを取得して追加する
+    const loadPage = async () => {
+        page += 1;
+        const params = new URLSearchParams({ q: query, page });
+        const response = await fetch(`${form.dataset.url}?${params}`);
+        const data = await response.json();
+
+        searchArea.querySelector(".search-more")?.remove();
+        if (page === 1) {
+            const header = document.createElement("div");
+            header.classList.add("d-flex", "justify-content-between", "align-items-center", "mb-3");
+            const count = document.createElement("h5");
+            count.textContent = `"${data.query}" の検索結果: ${data.total} 件`;
+            const close = document.createElement("button");
+            close.classList.add("btn", "btn-outline-secondary", "btn-sm");
+            close.textContent = "✕ 閉じる";
+            close.addEventListener("click", closeSearch);
+            header.append(count, close);
+            searchArea.appendChild(header);
+        }
+
+        data.results.forEach(hit => searchArea.appendChild(renderHit(hit)));
+
+        if (page * data.per_page < data.total) {
+            const more = document.createElement("button");
+            more.classList.add("btn", "btn-outline-primary", "w-100", "mb-4", "search-more");
+            more.textContent = "さらに表示";
+            more.addEventListener("click", loadPage);
+            searchArea.appendChild(more);
+        }
+    };
+
+    form.addEventListener("submit", (event) => {
+        event.preventDefault();
+        query = input.value.trim();
+        if (!query) {
+            closeSearch();
+            return;
+        }
+        page = 0;
+        searchArea.innerHTML = "";
+        searchArea.classList.remove("d-none");
+        resultsArea.classList.add("d-none");
+        loadPage();
     });
 });
@@ -0,0 +1,58 @@
+# cli/bench_archive.py
+# Usage example: python cli/bench_archive.py --repeat 200
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+# Import modules
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from modules.result_archive import LEGACY_SUFFIX, archive_path, archive_period, iter_archive_paths, read_archive, write_archive
+
+
+def load_time(path: Path, repeat: int) -> float:
+    """read_archive で path を repeat 回読み込んだときの1回あたりの秒数"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        read_archive(path)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    """search_result/ の従来の結果JSONを圧縮形式に書き出し、ファイルサイズと読み込み時間を比較する
+    """
+    parser = argparse.ArgumentParser(description="Result archive format benchmark")
+    parser.add_argument("--results-dir", type=str, default=str(ROOT / "search_result"), help="結果ファイルのディレクトリ")
+    parser.add_argument("--repeat", type=int, default=200, help="読み込み時間の計測で読み込む回数")
+    args = parser.parse_args()
+
+    legacy_paths = [path for path in iter_archive_paths(Path(args.results_dir), unique=False) if path.name.endswith(LEGACY_SUFFIX)]
+    if not legacy_paths:
+        print("No legacy JSON archives found.")
+        return
+
+    print(f"{'file':>24} | {'json bytes':>10} {'jsonl.gz':>9} {'ratio':>6} | {'json ms':>8} {'gz ms':>7}")
+    totals = [0, 0, 0.0, 0.0]
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in legacy_paths:
+            results = read_archive(path)
+            compact_path = archive_path(Path(tmp), archive_period(path))
+            write_archive(compact_path, results)
+            assert read_archive(compact_path) == results, f"round trip mismatch: {path.name}"
+
+            sizes = (path.stat().st_size, compact_path.stat().st_size)
+            times = (load_time(path, args.repeat), load_time(compact_path, args.repeat))
+            print(f"{archive_period(path):>24} | {sizes[0]:>10,} {sizes[1]:>9,} {sizes[1] / sizes[0]:>6.1%} | "
+                  f"{times[0] * 1000:>8.3f} {times[1] * 1000:>7.3f}")
+            for i, value in enumerate(sizes + times):
+                totals[i] += value
+
+    print(f"{'total':>24} | {totals[0]:>10,} {totals[1]:>9,} {totals[1] / totals[0]:>6.1%} | "
+          f"{totals[2] * 1000:>8.3f} {totals[3] * 1000:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
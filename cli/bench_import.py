@@ -0,0 +1,104 @@
+# cli/bench_import.py
+# Usage example: python cli/bench_import.py --copies 20
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from flask import Flask
+from sqlalchemy import event
+
+# Import modules
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from extensions import db
+import modules.bd_operator as bo
+from modules.result_archive import iter_archive_paths, read_archive
+
+
+def load_archives(results_dir: Path, copies: int) -> list[list]:
+    """search_result/ の結果ファイルを読み込み、copies 倍に複製する (複製分は pmid をずらして別論文にする)"""
+    archives = [read_archive(path) for path in iter_archive_paths(results_dir)]
+    datasets = []
+    for copy in range(copies):
+        for data in archives:
+            datasets.append([
+                {**block, "papers": [{**p, "pmid": f"{p['pmid']}{copy:04d}"} for p in block.get("papers", [])]}
+                for block in data
+            ])
+    return datasets
+
+
+def import_json_per_row(data):
+    """従来の import_json (キーワード・論文ごとに1クエリで既存確認する N+1 実装)"""
+    for block in data:
+        if "title" not in block or "error" in block:
+            continue
+        search = bo.SearchResult(title=block["title"], search_period=block.get("search_period"),
+                                 paper_count=block.get("paper_count"))
+        db.session.add(search)
+        for kw in block.get("keywords", []):
+            keyword = bo.Keyword.query.filter_by(name=kw).first()
+            if not keyword:
+                keyword = bo.Keyword(name=kw)
+                db.session.add(keyword)
+            search.keywords.append(keyword)
+        for rank, p in enumerate(block.get("papers", [])):
+            paper = bo.Paper.query.filter_by(pmid=p["pmid"]).first()
+            is_new = paper is None
+            if not paper:
+                paper = bo.Paper(pmid=p["pmid"], title=p.get("title") or "", pubdate=p.get("pubdate"),
+                                 url=p.get("url"), abstract=p.get("abstract"))
+                paper.summary = bo.PaperSummary(**bo.summary_columns(p.get("summary")))
+                db.session.add(paper)
+            db.session.add(bo.SearchHit(search_result=search, paper=paper, rank=rank,
+                                        search_period=search.search_period, is_new=is_new))
+    db.session.commit()
+
+
+def run(importer, datasets: list, db_path: Path) -> tuple[float, int, int]:
+    """空のDBに datasets を importer で取り込み (経過秒, 実行SQL数, 論文数) を返す"""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    bo.init_db(app)
+
+    with app.app_context():
+        queries = [0]
+
+        def count(*args):
+            queries[0] += 1
+
+        event.listen(db.engine, "before_cursor_execute", count)
+        start = time.perf_counter()
+        for data in datasets:
+            importer(data)
+        elapsed = time.perf_counter() - start
+        event.remove(db.engine, "before_cursor_execute", count)
+
+        n_papers = db.session.query(bo.Paper).count()
+        db.session.remove()
+        db.engine.dispose()
+    return elapsed, queries[0], n_papers
+
+
+def main():
+    """search_result/ の全ファイルを従来の N+1 実装と一括インポートで取り込み、時間とSQL数を比較する
+    """
+    parser = argparse.ArgumentParser(description="import_json benchmark")
+    parser.add_argument("--results-dir", type=str, default=str(ROOT / "search_result"), help="結果ファイルのディレクトリ")
+    parser.add_argument("--copies", type=int, default=20, help="アーカイブを複製して取り込む回数")
+    args = parser.parse_args()
+
+    datasets = load_archives(Path(args.results_dir), args.copies)
+    print(f"{len(datasets)} files, {sum(len(b.get('papers', [])) for d in datasets for b in d)} paper entries")
+
+    print(f"{'importer':>10} | {'sec':>7} {'queries':>8} {'papers':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, importer in (("per-row", import_json_per_row), ("bulk", bo.import_json)):
+            elapsed, queries, n_papers = run(importer, datasets, Path(tmp) / f"{name}.db")
+            print(f"{name:>10} | {elapsed:>7.2f} {queries:>8} {n_papers:>7}")
+
+
+if __name__ == "__main__":
+    main()
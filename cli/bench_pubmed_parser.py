@@ -0,0 +1,86 @@
+# cli/bench_pubmed_parser.py
+# Usage example: python cli/bench_pubmed_parser.py --sizes 50 200 800
+
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+# Import modules
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+import modules.pubmed_operator as po
+
+ARTICLE_TEMPLATE = """<PubmedArticle><MedlineCitation><PMID>{pmid}</PMID><Article>
+<Journal><JournalIssue><PubDate><Year>2025</Year><Month>Dec</Month></PubDate></JournalIssue></Journal>
+<ArticleTitle>Synthetic article {pmid} on <i>kidney</i> cancer immune therapy</ArticleTitle>
+<Abstract>
+<AbstractText Label="BACKGROUND">{text}</AbstractText>
+<AbstractText Label="METHODS">{text}</AbstractText>
+<AbstractText Label="RESULTS">{text}</AbstractText>
+<AbstractText Label="CONCLUSIONS">{text}</AbstractText>
+</Abstract>
+<ELocationID EIdType="doi">10.1000/bench.{pmid}</ELocationID>
+</Article></MedlineCitation>
+<PubmedData><ArticleIdList><ArticleId IdType="pubmed">{pmid}</ArticleId></ArticleIdList></PubmedData>
+</PubmedArticle>
+"""
+
+
+def write_efetch_xml(path: Path, n_articles: int) -> None:
+    """EFetch 形式のダミー XML を n_articles 件分書き出す"""
+    text = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<?xml version=\"1.0\" ?>\n<PubmedArticleSet>\n")
+        for i in range(n_articles):
+            f.write(ARTICLE_TEMPLATE.format(pmid=40000000 + i, text=text))
+        f.write("</PubmedArticleSet>\n")
+
+
+def measure(func) -> tuple[float, float, int]:
+    """func を実行し (経過秒, ピークメモリMB, 処理件数) を返す"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024, count
+
+
+def main():
+    """ET.fromstring による一括パースと iterparse による逐次パースのメモリ・速度を比較する
+    """
+    parser = argparse.ArgumentParser(description="PubMed EFetch XML parser benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 800, 3200], help="1レスポンスあたりの論文数")
+    args = parser.parse_args()
+
+    print(f"{'articles':>8} {'xml MB':>8} | {'fromstring MB':>13} {'sec':>6} | {'iterparse MB':>12} {'sec':>6}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            path = Path(tmp) / f"efetch_{n}.xml"
+            write_efetch_xml(path, n)
+            size_mb = path.stat().st_size / 1024 / 1024
+
+            # 一括パース: レスポンス全体を読み込んでツリー全体を保持する (従来の実装)
+            def dom_parse():
+                root = ET.fromstring(path.read_bytes())
+                return sum(1 for article in root.findall(".//PubmedArticle") if po._article_record(article))
+
+            # 逐次パース: ストリームから1件ずつレコードを生成して破棄する
+            def stream_parse():
+                with open(path, "rb") as f:
+                    return sum(1 for _ in po.iter_pubmed_articles(f))
+
+            dom_sec, dom_mb, dom_count = measure(dom_parse)
+            it_sec, it_mb, it_count = measure(stream_parse)
+            assert dom_count == it_count == n
+
+            print(f"{n:>8} {size_mb:>8.1f} | {dom_mb:>13.1f} {dom_sec:>6.2f} | {it_mb:>12.2f} {it_sec:>6.2f}")
+
+
+if __name__ == "__main__":
+    main()
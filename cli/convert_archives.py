@@ -0,0 +1,50 @@
+# cli/convert_archives.py
+# Usage example: python cli/convert_archives.py
+#                python cli/convert_archives.py --keep-legacy
+
+import sys
+import argparse
+from pathlib import Path
+
+# Import modules
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from modules.result_archive import LEGACY_SUFFIX, archive_path, archive_period, iter_archive_paths, read_archive, write_archive
+
+
+def main():
+    """search_result/ の従来の結果JSON (.json) を圧縮形式 (.jsonl.gz) に変換する
+
+    変換後のファイルを読み直して元の内容と一致することを確認してから、元の JSON を削除する。
+    """
+    parser = argparse.ArgumentParser(description="Convert legacy JSON archives to compressed JSON Lines")
+    parser.add_argument("--results-dir", type=str, default=str(ROOT / "search_result"), help="結果ファイルのディレクトリ")
+    parser.add_argument("--keep-legacy", action="store_true", help="変換後も元の JSON を削除しない")
+    args = parser.parse_args()
+
+    results_dir = Path(args.results_dir)
+    converted = 0
+    for path in iter_archive_paths(results_dir, unique=False):
+        if not path.name.endswith(LEGACY_SUFFIX):
+            continue
+        output_path = archive_path(results_dir, archive_period(path))
+        if output_path.exists():
+            print(f"skip (already converted): {path.name}")
+            continue
+
+        results = read_archive(path)
+        write_archive(output_path, results)
+        if read_archive(output_path) != results:
+            output_path.unlink()
+            print(f"[ERROR] 変換結果が元の内容と一致しないため中止しました: {path.name}")
+            continue
+
+        print(f"{path.name} ({path.stat().st_size:,} bytes) -> {output_path.name} ({output_path.stat().st_size:,} bytes)")
+        if not args.keep_legacy:
+            path.unlink()
+        converted += 1
+    print(f"{converted} files converted")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+# cli/migrate_json_to_db.py
+# Usage example: python cli/migrate_json_to_db.py --results-dir search_result
+
+import sys
+import argparse
+from pathlib import Path
+
+# Import modules
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+import modules.bd_operator as bo
+
+
+def main():
+    """search_result/ の結果ファイル (圧縮形式・従来の JSON) を検索結果DBに取り込む（取り込み済みの検索期間はスキップ）
+    """
+    parser = argparse.ArgumentParser(description="Migrate JSON archives into the results database")
+    parser.add_argument("--results-dir", type=str, default=str(bo.RESULTS_DIR), help="結果ファイルのディレクトリ")
+    args = parser.parse_args()
+
+    with bo.create_db_app().app_context():
+        imported = bo.sync_archives(Path(args.results_dir))
+    print(f"{imported} files imported into {bo.database_uri()}")
+
+
+if __name__ == "__main__":
+    main()
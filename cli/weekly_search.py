@@ -1,5 +1,7 @@
 # cli/weekly_search.py
 # Usage example: python cli/weekly_search.py --input settings/settings.json
+#                python cli/weekly_search.py --resume
+#                python cli/weekly_search.py --fill-deferred search_result/2025-01-01-2025-01-07.jsonl.gz
 
 import sys
 import argparse
@@ -18,12 +20,25 @@ def main():
     parser.add_argument("--input", type=str, default="keywords.json", help="入力キーワードファイル（JSON）")
     parser.add_argument("--mindate", type=str, default=None, help="検索開始日 (YYYY/MM/DD)")
     parser.add_argument("--maxdate", type=str, default=None, help="検索終了日 (YYYY/MM/DD)")
+    parser.add_argument("--page-size", type=int, default=se.DEFAULT_PAGE_SIZE, help="PubMedから1回に取得する論文数")
+    parser.add_argument("--max-llm-calls", type=int, default=se.DEFAULT_MAX_LLM_CALLS, help="1回の実行でGeminiに送る要約リクエスト数の上限")
+    parser.add_argument("--max-tokens", type=int, default=None, help="1回の実行でGeminiに送る推定トークン数の上限")
+    parser.add_argument("--resume", action="store_true", help="中断した実行をジャーナルから再開する（完了済みの検索・要約は省略）")
+    parser.add_argument("--fill-deferred", type=str, default=None, help="結果JSONのうちGeminiの不調で後回しにした要約だけを再要約する")
     args = parser.parse_args()
+
+    if args.fill_deferred:
+        se.fill_deferred_file(args.fill_deferred)
+        return
     
     se.run_weekly_search(
         input_path=args.input,
         mindate=args.mindate,
         maxdate=args.maxdate,
+        page_size=args.page_size,
+        max_llm_calls=args.max_llm_calls,
+        max_tokens=args.max_tokens,
+        resume=args.resume,
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,5 @@
+# extensions.py
+from flask_sqlalchemy import SQLAlchemy
+
+# アプリ全体で共有する拡張機能のインスタンス (create_app で init_app する)
+db = SQLAlchemy()
@@ -0,0 +1,142 @@
+# archive_catalog.py
+import os
+import re
+import sys
+import json
+import threading
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from modules.result_archive import ARCHIVE_PATTERN, archive_period, is_archive_path, iter_archive_paths, read_archive
+
+DEFAULT_RESULTS_DIR = ROOT / "search_result"
+DEFAULT_CATALOG_PATH = ROOT / "cache" / "archive_catalog.json"
+
+
+class ArchiveCatalog:
+    """search_result/ の結果ファイル (圧縮形式・従来の JSON) の一覧 (カタログ) を保持する永続インデックス (JSONファイル)
+
+    ファイルごとに検索期間・サイズ・更新時刻・検索タイトル・論文数を記録する。
+    同じ検索期間のファイルが両方の形式で残っている場合は、圧縮形式のものだけを登録する。
+    ディレクトリの更新時刻が前回と同じ間は再走査せず、変わった場合も
+    サイズ・更新時刻が変わったファイルだけを読み直す。
+
+    Attributes:
+        results_dir (Path): 結果ファイルのディレクトリ
+        path (Path): カタログファイルのパス
+    """
+
+    def __init__(self, results_dir: Path = DEFAULT_RESULTS_DIR, path: Path = DEFAULT_CATALOG_PATH):
+        self.results_dir = Path(results_dir)
+        self.path = Path(path)
+
+        self._lock = threading.Lock()
+        catalog = self._load()
+        self._dir_mtime = catalog.get("dir_mtime_ns")
+        self._entries = catalog.get("entries", {})
+
+    def refresh(self) -> list[Path]:
+        """ディレクトリが変わっていればカタログを更新する
+
+        Returns:
+            list[Path]: 追加・更新されたファイル
+        """
+        with self._lock:
+            try:
+                dir_mtime = self.results_dir.stat().st_mtime_ns
+            except FileNotFoundError:
+                dir_mtime = None
+            if dir_mtime == self._dir_mtime:
+                return []
+
+            entries = {}
+            changed = []
+            for path in iter_archive_paths(self.results_dir) if dir_mtime is not None else []:
+                match = ARCHIVE_PATTERN.search(path.name)
+                stat = path.stat()
+                entry = self._entries.get(path.name)
+                if entry is None or entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+                    entry = self._scan(path, match, stat)
+                    changed.append(path)
+                entries[path.name] = entry
+
+            self._entries = entries
+            self._dir_mtime = dir_mtime
+            self._save()
+            if changed:
+                print(f"(ArchiveCatalog) {len(changed)} 件の結果ファイルをカタログに登録しました。")
+            return changed
+
+    def entries(self) -> list[dict]:
+        """カタログのエントリを終了日の新しい順に返す"""
+        with self._lock:
+            return sorted(self._entries.values(), key=lambda entry: (entry["end_date"], entry["name"]), reverse=True)
+
+    def get(self, name: str) -> Optional[dict]:
+        """ファイル名に対応するエントリ。無ければ None
+
+        登録されていない形式のファイル名 (変換前の .json など) は、同じ検索期間のエントリを返す。
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None and is_archive_path(name):
+                period = archive_period(name)
+                entry = next((entry for entry in self._entries.values() if entry["period"] == period), None)
+            return entry
+
+    @staticmethod
+    def _scan(path: Path, match: re.Match, stat: os.stat_result) -> dict:
+        """結果ファイルを読み込み、カタログのエントリを作る"""
+        try:
+            data = read_archive(path)
+        except (ValueError, KeyError, EOFError, OSError):
+            print(f"(ArchiveCatalog) 結果ファイルを読み込めませんでした: {path}")
+            data = []
+
+        searches = [
+            {"title": block["title"], "paper_count": len(block.get("papers", []))}
+            for block in data if isinstance(block, dict) and "title" in block
+        ]
+        return {
+            "name": path.name,
+            "period": f"{match.group(1)}-{match.group(2)}",
+            "start_date": match.group(1),
+            "end_date": match.group(2),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "searches": searches,
+            "paper_count": sum(search["paper_count"] for search in searches),
+        }
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps({"dir_mtime_ns": self._dir_mtime, "entries": self._entries}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        tmp_path.replace(self.path)
+
+    def _load(self) -> dict:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            print(f"(ArchiveCatalog) カタログを読み込めなかったため作り直します: {self.path}")
+            return {}
+
+
+_default_catalog: Optional[ArchiveCatalog] = None
+_default_lock = threading.Lock()
+
+
+def get_archive_catalog() -> ArchiveCatalog:
+    """プロセス共有の ArchiveCatalog を返す（初回呼び出し時に生成）"""
+    global _default_catalog
+    with _default_lock:
+        if _default_catalog is None:
+            _default_catalog = ArchiveCatalog()
+        return _default_catalog
@@ -1,8 +1,32 @@
 #db_operator.py
-from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate 
-from sqlalchemy.exc import IntegrityError
+import os
+import sys
+import html
+from pathlib import Path
+from typing import Optional
+from flask import Flask
+from sqlalchemy import bindparam, delete, event, func, insert, select, text, update
+from sqlalchemy.orm import defer, selectinload
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
 from extensions import db
+from modules.result_archive import archive_period, is_archive_path, iter_archive_paths, read_archive
+
+# 検索結果DB (環境変数 DATABASE_URL で上書きできる)
+DEFAULT_DB_PATH = ROOT / "instance" / "journal_scraper.db"
+RESULTS_DIR = ROOT / "search_result"
+
+# 一括インポートで1回の INSERT (executemany) にまとめる論文数 (IN 句に渡すID数の上限も兼ねる)
+IMPORT_BATCH_SIZE = 500
+
+# 全文検索インデックス (SQLite FTS5)。日本語の要約も分かち書きなしで部分一致させるため trigram で分割する
+FTS_TABLE = "papers_fts"
+FTS_COLUMNS = ("title", "abstract", "purpose", "sample", "method", "result", "conclusion")
+# bm25 の列ごとの重み (タイトル > 要約 > アブストラクト)
+FTS_WEIGHTS = (5.0, 1.0, 2.0, 2.0, 2.0, 2.0, 2.0)
+# trigram で索引できない短い (3文字未満の) 検索語は LIKE で絞り込む
+FTS_MIN_TERM_LENGTH = 3
 
 """ 
 # データ構造
@@ -12,7 +36,7 @@ SearchResult
  ├─ keywords[]
  ├─ search_period
  ├─ paper_count
- └─ papers[]
+ └─ papers[]  (SearchHit: 検索結果と論文の多対多。同じ論文は複数の検索結果にヒットしうる)
         ├─ pmid
         ├─ title
         ├─ pubdate
@@ -30,17 +54,21 @@ class SearchResult(db.Model):
         title (str): 検索タイトル
         search_period (str): 検索期間
         paper_count (int): 今回の検索でヒットした論文数
-        papers (list of Paper): Pubmedから取得した論文情報 (Paperオブジェクトのリスト)
+        hits (list of SearchHit): この検索でのヒット情報 (順位順)
+        papers (list of Paper): Pubmedから取得した論文情報 (Paperオブジェクトのリスト, 順位順)
         keywords (list of Keyword): 論文検索に使用したキーワード
     """
     __tablename__ = "search_results"
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
-    search_period = db.Column(db.String(50))
+    search_period = db.Column(db.String(50), index=True)
     paper_count = db.Column(db.Integer)
     keywords = db.relationship("Keyword", secondary="search_result_keywords", back_populates="search_results")
-    papers = db.relationship("Paper", backref="search_result", lazy=True)
+    hits = db.relationship("SearchHit", back_populates="search_result", order_by="SearchHit.rank", lazy=True)
+    papers = db.relationship(
+        "Paper", secondary="search_hits", order_by="SearchHit.rank", viewonly=True, back_populates="search_results"
+    )
 
 class Keyword(db.Model):
     """検索キーワードモデル
@@ -61,9 +89,40 @@ class Keyword(db.Model):
 search_result_keywords = db.Table(
     "search_result_keywords",
     db.Column("search_result_id", db.Integer, db.ForeignKey("search_results.id")),
-    db.Column("keyword_id", db.Integer, db.ForeignKey("keywords.id"))
+    db.Column("keyword_id", db.Integer, db.ForeignKey("keywords.id")),
+    db.Index("ix_search_result_keywords_keyword", "keyword_id", "search_result_id"),
+    db.Index("ix_search_result_keywords_search", "search_result_id", "keyword_id"),
 )
 
+class SearchHit(db.Model):
+    """検索結果と論文の多対多関係 (ヒット情報付き) モデル
+
+    同じ論文が複数の検索・検索期間でヒットしても、それぞれのヒットを残す。
+
+    Attributes:
+        search_result_id (int): 検索結果のID (複合主キー, 外部キー)
+        paper_id (int): 論文のID (複合主キー, 外部キー)
+        rank (int): 検索結果内での順位 (0始まり)
+        search_period (str): 検索期間 (期間ごとの集計用に SearchResult から複製)
+        is_new (bool): DB に初めて登録されたときのヒットか (それ以前の検索でヒット済みなら False)
+    """
+    __tablename__ = "search_hits"
+    __table_args__ = (
+        # 論文 → ヒットした検索の履歴 (期間順)
+        db.Index("ix_search_hits_paper_period", "paper_id", "search_period", "search_result_id"),
+        # 検索結果 → 順位順の論文
+        db.Index("ix_search_hits_search_rank", "search_result_id", "rank", "paper_id"),
+    )
+
+    search_result_id = db.Column(db.Integer, db.ForeignKey("search_results.id"), primary_key=True)
+    paper_id = db.Column(db.Integer, db.ForeignKey("papers.id"), primary_key=True)
+    rank = db.Column(db.Integer, nullable=False)
+    search_period = db.Column(db.String(50))
+    is_new = db.Column(db.Boolean, nullable=False, default=True)
+
+    search_result = db.relationship("SearchResult", back_populates="hits")
+    paper = db.relationship("Paper", back_populates="hits")
+
 # 論文モデル
 class Paper(db.Model):
     """論文メタデータモデル
@@ -75,7 +134,8 @@ class Paper(db.Model):
         pubdate (str): 出版日
         url (str): 論文URL
         abstract (str): 論文要旨(英語)
-        search_result_id (int): 関連する検索結果のID (外部キー)
+        hits (list of SearchHit): この論文がヒットした検索のヒット情報
+        search_results (list of SearchResult): この論文がヒットした検索結果
         summary (PaperSummary): 論文要約情報 (PaperSummaryオブジェクト)
     """
     __tablename__ = "papers"
@@ -83,11 +143,14 @@ class Paper(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     pmid = db.Column(db.String(20), unique=True, nullable=False)
     title = db.Column(db.Text, nullable=False)
-    pubdate = db.Column(db.String(50))
+    pubdate = db.Column(db.String(50), index=True)
     url = db.Column(db.Text)
     abstract = db.Column(db.Text)
 
-    search_result_id = db.Column(db.Integer, db.ForeignKey("search_results.id"), nullable=False)
+    hits = db.relationship("SearchHit", back_populates="paper", lazy=True)
+    search_results = db.relationship(
+        "SearchResult", secondary="search_hits", viewonly=True, back_populates="papers"
+    )
     summary = db.relationship("PaperSummary", uselist=False, backref="paper", cascade="all, delete")
 
 
@@ -115,59 +178,488 @@ class PaperSummary(db.Model):
 
     paper_id = db.Column(db.Integer,db.ForeignKey("papers.id"), unique=True, nullable=False)
 
-def import_json(data):
-    """JSONにまとめたデータをDBに挿入する（pmid重複対応版）"""
-
-    for block in data:
-        # search result
-        search = SearchResult(
-            title=block["title"],
-            search_period=block["search_period"],
-            paper_count=block["paper_count"]
-        )
-        db.session.add(search)
-
-        # keywords（多対多）
-        for kw in block["keywords"]:
-            keyword = Keyword.query.filter_by(name=kw).first()
-            if not keyword:
-                keyword = Keyword(name=kw)
-                db.session.add(keyword)
-            search.keywords.append(keyword)
-
-        # papers
-        for p in block["papers"]:
-            # 既存論文チェック（pmid）
-            paper = Paper.query.filter_by(pmid=p["pmid"]).first()
-
-            if not paper:
-                # 新規論文
-                paper = Paper(
-                    pmid=p["pmid"],
-                    title=p["title"],
-                    pubdate=p["pubdate"],
-                    url=p["url"],
-                    abstract=p["abstract"],
-                )
-
-                # summary
-                s = p.get("summary", {})
-                summary = PaperSummary(
-                    purpose=s.get("目的"),
-                    sample=s.get("サンプル"),
-                    method=s.get("解析手法"),
-                    result=s.get("結果"),
-                    conclusion=s.get("結論"),
-                )
-                paper.summary = summary
-                db.session.add(paper)
-
-            paper.search_result = search
+def database_uri() -> str:
+    """検索結果DBの接続先 (DATABASE_URL が未設定なら instance/journal_scraper.db の SQLite)"""
+    return os.getenv("DATABASE_URL") or f"sqlite:///{DEFAULT_DB_PATH}"
+
+
+def init_db(app: Flask) -> None:
+    """Flask アプリに検索結果DBを設定し、テーブル・インデックスを作成する
+
+    SQLite の場合は接続ごとに WAL モードを有効にし、閲覧 (読み込み) と
+    定期検索 (書き込み) が同時に動いても互いを待たないようにする。
+    """
+    app.config.setdefault("SQLALCHEMY_DATABASE_URI", database_uri())
+    db.init_app(app)
+
+    with app.app_context():
+        if db.engine.dialect.name == "sqlite":
+            if db.engine.url.database:
+                Path(db.engine.url.database).parent.mkdir(parents=True, exist_ok=True)
+            event.listen(db.engine, "connect", _set_sqlite_pragma)
+        db.create_all()
+        _ensure_fts()
+
+
+def _fts_enabled() -> bool:
+    return db.engine.dialect.name == "sqlite"
+
+
+def _ensure_fts() -> None:
+    """全文検索インデックスを作成する。論文が登録済みでインデックスが空の場合は全件を索引する"""
+    if not _fts_enabled():
+        return
+    db.session.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5({', '.join(FTS_COLUMNS)}, tokenize='trigram')"
+    ))
+    indexed = db.session.execute(text(f"SELECT count(*) FROM {FTS_TABLE}")).scalar()
+    if not indexed and db.session.execute(select(Paper.id).limit(1)).first():
+        print("(init_db) 全文検索インデックスを作成します...")
+        db.session.execute(text(f"INSERT INTO {FTS_TABLE}(rowid, {', '.join(FTS_COLUMNS)}) {_FTS_SOURCE}"))
+    db.session.commit()
+
+
+# 全文検索インデックスに登録する列 (papers.id を rowid とする)
+_FTS_SOURCE = """
+    SELECT papers.id, papers.title, papers.abstract,
+           paper_summaries.purpose, paper_summaries.sample, paper_summaries.method,
+           paper_summaries.result, paper_summaries.conclusion
+    FROM papers LEFT JOIN paper_summaries ON paper_summaries.paper_id = papers.id
+"""
+
+
+def index_papers(paper_ids: list[int]) -> None:
+    """論文を全文検索インデックスに登録し直す (追加・要約の更新時に呼ぶ。コミットは呼び出し側で行う)"""
+    if not paper_ids or not _fts_enabled():
+        return
+    ids = bindparam("ids", expanding=True)
+    db.session.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid IN :ids").bindparams(ids), {"ids": paper_ids})
+    db.session.execute(
+        text(f"INSERT INTO {FTS_TABLE}(rowid, {', '.join(FTS_COLUMNS)}) {_FTS_SOURCE} WHERE papers.id IN :ids")
+        .bindparams(ids),
+        {"ids": paper_ids},
+    )
+
+
+def search_papers(query: str, page: int = 1, per_page: int = 20) -> dict:
+    """タイトル・アブストラクト・要約を全文検索し、関連度順に1ページ分を返す
+
+    空白区切りの検索語をすべて含む論文を bm25 (タイトルを重視) の順に並べる。
+
+    Args:
+        query (str): 検索語 (空白区切りで AND)
+        page (int, optional): ページ番号 (1始まり). Defaults to 1.
+        per_page (int, optional): 1ページあたりの件数. Defaults to 20.
+
+    Returns:
+        dict: {"query", "total", "page", "per_page",
+               "results": [{"pmid", "title", "pubdate", "url", "snippet_html", "search_periods"}, ...]}
+    """
+    terms = query.split()
+    response = {"query": query, "total": 0, "page": page, "per_page": per_page, "results": []}
+    if not terms or not _fts_enabled():
+        return response
+
+    # 3文字以上の語は MATCH (フレーズとして引用), 短い語はいずれかの列の部分一致で絞り込む
+    long_terms = [term for term in terms if len(term) >= FTS_MIN_TERM_LENGTH]
+    short_terms = [term for term in terms if len(term) < FTS_MIN_TERM_LENGTH]
+    params = {}
+    conditions = []
+    if long_terms:
+        params["match"] = " ".join('"' + term.replace('"', '""') + '"' for term in long_terms)
+        conditions.append(f"{FTS_TABLE} MATCH :match")
+    for i, term in enumerate(short_terms):
+        params[f"like{i}"] = f"%{term}%"
+        conditions.append("(" + " OR ".join(f"{FTS_TABLE}.{column} LIKE :like{i}" for column in FTS_COLUMNS) + ")")
+    where = " AND ".join(conditions)
+    # 関連度順。MATCH が無い (短い語のみの) 場合は新しく登録された論文を上位にする
+    if long_terms:
+        order = f"bm25({FTS_TABLE}, {', '.join(map(str, FTS_WEIGHTS))})"
+        snippet = f"snippet({FTS_TABLE}, -1, char(2), char(3), '…', 24)"
+    else:
+        order = f"{FTS_TABLE}.rowid DESC"
+        snippet = f"substr({FTS_TABLE}.abstract, 1, 160)"
+
+    response["total"] = db.session.execute(text(f"SELECT count(*) FROM {FTS_TABLE} WHERE {where}"), params).scalar()
+    # 1ページ分を索引だけで絞り込んでから論文情報を取得する (結合すると全件に対して snippet 等が計算される)
+    hits = db.session.execute(text(f"""
+        SELECT {FTS_TABLE}.rowid AS paper_id, {snippet} AS snippet
+        FROM {FTS_TABLE}
+        WHERE {where}
+        ORDER BY {order}
+        LIMIT :limit OFFSET :offset
+    """), {**params, "limit": per_page, "offset": (page - 1) * per_page}).mappings().all()
+    papers = {
+        paper.id: paper
+        for paper in db.session.execute(select(Paper).where(Paper.id.in_([hit["paper_id"] for hit in hits]))).scalars()
+    } if hits else {}
+    rows = [
+        {"paper": papers[hit["paper_id"]], "snippet": hit["snippet"]}
+        for hit in hits if hit["paper_id"] in papers
+    ]
+
+    periods = {}
+    if rows:
+        for paper_id, period in db.session.execute(
+            select(SearchHit.paper_id, SearchHit.search_period)
+            .where(SearchHit.paper_id.in_([row["paper"].id for row in rows]))
+            .order_by(SearchHit.search_period)
+        ):
+            periods.setdefault(paper_id, []).append(period)
+
+    response["results"] = [
+        {
+            "pmid": row["paper"].pmid,
+            "title": row["paper"].title,
+            "pubdate": row["paper"].pubdate,
+            "url": row["paper"].url,
+            "snippet_html": _snippet_html(row["snippet"]),
+            "search_periods": list(dict.fromkeys(periods.get(row["paper"].id, []))),
+        }
+        for row in rows
+    ]
+    return response
+
+
+def _snippet_html(snippet) -> str:
+    """FTS5 の snippet (一致箇所を \\x02 / \\x03 で囲んだ文字列) をエスケープして <mark> で強調する"""
+    return html.escape(snippet or "").replace("\x02", "<mark>").replace("\x03", "</mark>")
+
+
+def create_db_app() -> Flask:
+    """CLI から検索結果DBを使うための最小構成の Flask アプリを作成する"""
+    app = Flask(__name__, root_path=str(ROOT))
+    init_db(app)
+    return app
+
+
+def _set_sqlite_pragma(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def store_results(data, search_period: str = None) -> bool:
+    """検索結果をDBに保存する。同じ検索期間の結果が保存済みの場合は保存しない
+
+    Args:
+        data (list): 検索結果JSON (manual_search の戻り値) の内容
+        search_period (str, optional): 検索期間を持たないブロック (0件の検索など) に使う検索期間
+
+    Returns:
+        bool: 保存した場合 True
+    """
+    periods = {block.get("search_period") for block in data if block.get("search_period")} | {search_period}
+    periods.discard(None)
+    if periods and db.session.execute(
+        select(SearchResult.id).where(SearchResult.search_period.in_(periods)).limit(1)
+    ).first():
+        print(f"(store_results) 検索期間 {', '.join(sorted(periods))} の結果は保存済みのためスキップします。")
+        return False
+
+    stats = import_json(data, search_period=search_period)
+    print(f"(store_results) 検索結果 {stats['search_results']} 件, 論文 {stats['papers']} 件 (既存 {stats['existing_papers']} 件) を保存しました。")
+    return True
+
+
+def sync_archives(results_dir: Path = RESULTS_DIR, paths: list[Path] = None) -> int:
+    """search_result/ の結果ファイルのうち、DBに未登録の検索期間のものを取り込む (アーカイブの移行)
+
+    圧縮形式 (.jsonl.gz)・従来の JSON (.json) のどちらも取り込む。
+
+    Args:
+        results_dir (Path, optional): 結果ファイルのディレクトリ. Defaults to RESULTS_DIR.
+        paths (list[Path], optional): 確認するファイル (ArchiveCatalog で変更を検出したもの). Defaults to ディレクトリ内の全ファイル.
+
+    Returns:
+        int: 取り込んだファイル数
+    """
+    stored = set(db.session.execute(select(SearchResult.search_period).distinct()).scalars())
+    imported = 0
+    for path in sorted(paths if paths is not None else iter_archive_paths(results_dir)):
+        if not is_archive_path(path):
+            continue
+        period = archive_period(path)
+        if period in stored:
+            continue
+        if store_results(read_archive(path), search_period=period):
+            stored.add(period)
+            imported += 1
+    if imported:
+        print(f"(sync_archives) {imported} 件の結果ファイルをDBに取り込みました。")
+    return imported
+
+
+def list_searches(search_period: str) -> list[dict]:
+    """検索期間の検索ブロックの一覧 (論文を含まない) を返す
+
+    Returns:
+        list[dict]: [{"id", "title", "keywords", "search_period", "paper_count", "stored_papers"}, ...]
+            stored_papers はDBに保存済みの (ページングできる) 論文数
+    """
+    searches = db.session.execute(
+        select(SearchResult)
+        .where(SearchResult.search_period == search_period)
+        .options(selectinload(SearchResult.keywords))
+        .order_by(SearchResult.id)
+    ).scalars().all()
+    stored = dict(db.session.execute(
+        select(SearchHit.search_result_id, func.count())
+        .where(SearchHit.search_result_id.in_([search.id for search in searches]))
+        .group_by(SearchHit.search_result_id)
+    ).tuples().all()) if searches else {}
+    return [
+        {
+            "id": search.id,
+            "title": search.title,
+            "keywords": [keyword.name for keyword in search.keywords],
+            "search_period": search.search_period,
+            "paper_count": search.paper_count,
+            "stored_papers": stored.get(search.id, 0),
+        }
+        for search in searches
+    ]
+
+
+def load_search_papers(search_id: int, page: int = 1, per_page: int = 20) -> Optional[dict]:
+    """検索ブロックの論文を順位順に1ページ分返す (アブストラクトは含めない)
+
+    Returns:
+        dict: {"search_id", "page", "per_page", "total", "has_more", "papers": [論文エントリ (abstract なし), ...]}
+            検索ブロックが無ければ None
+    """
+    if db.session.get(SearchResult, search_id) is None:
+        return None
+    total = db.session.execute(
+        select(func.count()).select_from(SearchHit).where(SearchHit.search_result_id == search_id)
+    ).scalar()
+    papers = db.session.execute(
+        select(Paper)
+        .join(SearchHit, SearchHit.paper_id == Paper.id)
+        .where(SearchHit.search_result_id == search_id)
+        .options(defer(Paper.abstract), selectinload(Paper.summary))
+        .order_by(SearchHit.rank)
+        .limit(per_page)
+        .offset((page - 1) * per_page)
+    ).scalars().all()
+    return {
+        "search_id": search_id,
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "has_more": page * per_page < total,
+        "papers": [to_paper_dict(paper, with_abstract=False) for paper in papers],
+    }
+
+
+def load_abstract(pmid: str) -> Optional[str]:
+    """論文のアブストラクトを返す。論文が無ければ None"""
+    return db.session.execute(select(Paper.abstract).where(Paper.pmid == pmid)).scalar()
+
+
+def to_paper_dict(paper: "Paper", with_abstract: bool = True) -> dict:
+    """Paper を結果JSONの論文エントリの形式に変換する (with_abstract=False ではアブストラクトを含めない)"""
+    summary = paper.summary
+    entry = {
+        "pmid": paper.pmid,
+        "title": paper.title,
+        "pubdate": paper.pubdate,
+        "url": paper.url,
+        "summary": {
+            label: getattr(summary, column)
+            for label, column in SUMMARY_COLUMNS.items()
+            if summary is not None and getattr(summary, column) is not None
+        },
+    }
+    if with_abstract:
+        entry["abstract"] = paper.abstract
+    return entry
+
+
+def update_summaries(summaries: dict) -> int:
+    """保存済みの論文の要約を更新する (後回しにした要約を埋めた場合など)
+
+    Args:
+        summaries (dict): {pmid: 要約}
+
+    Returns:
+        int: 更新した論文数
+    """
+    paper_ids = _fetch_ids(Paper, Paper.pmid, list(summaries), IMPORT_BATCH_SIZE)
+    rows = [
+        {**summary_columns(summaries[pmid]), "paper_id": paper_id}
+        for pmid, paper_id in paper_ids.items()
+    ]
+    if rows:
+        summary_ids = dict(db.session.execute(
+            select(PaperSummary.paper_id, PaperSummary.id).where(PaperSummary.paper_id.in_(list(paper_ids.values())))
+        ).tuples().all())
+        db.session.execute(update(PaperSummary), [
+            {**row, "id": summary_ids[row["paper_id"]]} for row in rows if row["paper_id"] in summary_ids
+        ])
+        index_papers(list(paper_ids.values()))
+        db.session.commit()
+    return len(rows)
+
+
+def clear_results() -> None:
+    """DBの検索結果をすべて削除する"""
+    db.session.execute(delete(SearchHit))
+    db.session.execute(delete(PaperSummary))
+    db.session.execute(delete(Paper))
+    db.session.execute(search_result_keywords.delete())
+    db.session.execute(delete(SearchResult))
+    db.session.execute(delete(Keyword))
+    if _fts_enabled():
+        db.session.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    db.session.commit()
+
+
+def import_json(data, batch_size: int = IMPORT_BATCH_SIZE, search_period: str = None):
+    """JSONにまとめたデータをDBに一括挿入する（pmid重複対応版）
+
+    既存のキーワード・論文の確認はバッチごとに IN 句1回でまとめて行い、
+    新規の行は batch_size 件ずつ executemany でまとめて挿入する。
+    既に登録済みの pmid の論文は登録し直さず、検索結果とのヒット (SearchHit) だけを追加する。
+    取り込みは1トランザクションで行い、途中で失敗した場合は検索結果も含めてすべてロールバックする
+    (検索結果だけが残ると、その検索期間は保存済みとみなされて取り込み直されないため)。
+
+    Args:
+        data (list): 検索結果JSON (manual_search の戻り値) の内容
+        batch_size (int, optional): 1回の INSERT にまとめる論文数. Defaults to IMPORT_BATCH_SIZE.
+        search_period (str, optional): 検索期間を持たないブロック (0件の検索など) に使う検索期間
+
+    Returns:
+        dict: {"search_results": 追加した検索結果数, "papers": 新規論文数, "existing_papers": 既存論文数,
+               "hits": 追加したヒット数}
+    """
+    blocks = [block for block in data if "title" in block and "error" not in block]
+    stats = {"search_results": len(blocks), "papers": 0, "existing_papers": 0, "hits": 0}
+    if not blocks:
+        return stats
 
     try:
+        # keywords（多対多）: 既存をまとめて取得し、無いものだけ挿入する
+        names = list(dict.fromkeys(kw for block in blocks for kw in block.get("keywords", [])))
+        keyword_ids = _fetch_ids(Keyword, Keyword.name, names, batch_size)
+        missing = [name for name in names if name not in keyword_ids]
+        if missing:
+            db.session.execute(insert(Keyword), [{"name": name} for name in missing])
+            keyword_ids.update(_fetch_ids(Keyword, Keyword.name, missing, batch_size))
+
+        # search results
+        searches = [
+            SearchResult(
+                title=block["title"],
+                search_period=block.get("search_period", search_period),
+                paper_count=block.get("paper_count", len(block.get("papers", []))),
+            )
+            for block in blocks
+        ]
+        db.session.add_all(searches)
+        db.session.flush()
+
+        links = [
+            {"search_result_id": search.id, "keyword_id": keyword_ids[kw]}
+            for search, block in zip(searches, blocks)
+            for kw in dict.fromkeys(block.get("keywords", []))
+        ]
+        if links:
+            db.session.execute(search_result_keywords.insert(), links)
+
+        # papers / hits: 論文は pmid ごとに1件だけ登録し、各検索結果とのヒットを順位付きで記録する
+        items = [
+            (search, rank, p)
+            for search, block in zip(searches, blocks)
+            for rank, p in enumerate(block.get("papers", []))
+        ]
+        seen = set()
+        for start in range(0, len(items), batch_size):
+            new_papers, existing, hits = _import_paper_chunk(items[start:start + batch_size], seen, batch_size)
+            stats["papers"] += new_papers
+            stats["existing_papers"] += existing
+            stats["hits"] += hits
         db.session.commit()
-    except IntegrityError:
+    except Exception:
         db.session.rollback()
         raise
 
+    return stats
+
+
+def _import_paper_chunk(chunk: list, seen: set, batch_size: int) -> tuple[int, int, int]:
+    """(SearchResult, 順位, 論文エントリ) のリスト1バッチ分の論文とヒットを挿入する
+
+    seen にはこの取り込みで登録済みの pmid を記録する (取り込み内での2回目以降のヒットは is_new=False)。
+
+    Returns:
+        tuple: (新規論文数, 登録済みだった論文数, 追加したヒット数)
+    """
+    pmids = list(dict.fromkeys(p["pmid"] for _, _, p in chunk))
+    paper_ids = _fetch_ids(Paper, Paper.pmid, pmids, batch_size)
+    existing = [pmid for pmid in pmids if pmid in paper_ids and pmid not in seen]
+
+    new_papers = {}
+    for _, _, p in chunk:
+        if p["pmid"] not in paper_ids:
+            new_papers.setdefault(p["pmid"], p)
+    if new_papers:
+        db.session.execute(insert(Paper), [
+            {
+                "pmid": pmid,
+                "title": p.get("title") or "",
+                "pubdate": p.get("pubdate"),
+                "url": p.get("url"),
+                "abstract": p.get("abstract"),
+            }
+            for pmid, p in new_papers.items()
+        ])
+        paper_ids.update(_fetch_ids(Paper, Paper.pmid, list(new_papers), batch_size))
+        db.session.execute(insert(PaperSummary), [
+            {**summary_columns(p.get("summary")), "paper_id": paper_ids[pmid]}
+            for pmid, p in new_papers.items()
+        ])
+        index_papers([paper_ids[pmid] for pmid in new_papers])
+
+    hits = {}
+    for search, rank, p in chunk:
+        key = (search.id, paper_ids[p["pmid"]])
+        if key in hits:
+            continue
+        hits[key] = {
+            "search_result_id": search.id,
+            "paper_id": paper_ids[p["pmid"]],
+            "rank": rank,
+            "search_period": search.search_period,
+            "is_new": p["pmid"] in new_papers and p["pmid"] not in seen,
+        }
+        seen.add(p["pmid"])
+    db.session.execute(insert(SearchHit), list(hits.values()))
+
+    return len(new_papers), len(existing), len(hits)
+
+
+# 要約の項目名と PaperSummary の列の対応
+SUMMARY_COLUMNS = {
+    "目的": "purpose",
+    "サンプル": "sample",
+    "解析手法": "method",
+    "結果": "result",
+    "結論": "conclusion",
+}
+
+
+def summary_columns(summary) -> dict:
+    """要約 (dict) を PaperSummary の列に対応付ける。要約がエラー・文字列の場合は空欄"""
+    s = summary if isinstance(summary, dict) and not summary.get("error") else {}
+    return {column: s.get(label) for label, column in SUMMARY_COLUMNS.items()}
+
 
+def _fetch_ids(model, column, values: list, batch_size: int) -> dict:
+    """column の値が values に含まれる行の {値: id} を batch_size 件ずつの IN 句で取得する"""
+    ids = {}
+    for start in range(0, len(values), batch_size):
+        chunk = values[start:start + batch_size]
+        ids.update(db.session.execute(select(column, model.id).where(column.in_(chunk))).all())
+    return ids
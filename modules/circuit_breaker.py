@@ -0,0 +1,66 @@
+# circuit_breaker.py
+import time
+import threading
+
+
+class CircuitOpenError(Exception):
+    """サーキットブレーカーが開いているため呼び出しを行わなかったことを示す例外"""
+
+
+class CircuitBreaker:
+    """連続した失敗を検知して外部サービスへの呼び出しを一時停止するサーキットブレーカー
+
+    - closed: 通常状態。失敗が failure_threshold 回連続すると open に移る
+    - open: 呼び出しを即座に拒否する。cooldown 秒経過すると half-open に移る
+    - half-open: 試行を1件だけ通し、成功すれば closed、失敗すれば再び open に戻る
+
+    Attributes:
+        failure_threshold (int): open に移るまでの連続失敗回数
+        cooldown (float): open から half-open に移るまでの秒数
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """現在の状態 ("closed" / "open" / "half-open")"""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.cooldown:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        """呼び出しを行ってよいかを返す (half-open では最初の1件のみ True)"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.cooldown and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """呼び出しの成功を記録し、closed に戻す"""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """呼び出しの失敗を記録する。連続失敗が閾値に達するか half-open の試行が失敗すると open にする"""
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_in_flight:
+                    print(f"(CircuitBreaker) 連続 {self._failures} 回失敗したため {self.cooldown:.0f} 秒間呼び出しを停止します。")
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
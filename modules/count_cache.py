@@ -0,0 +1,124 @@
+# count_cache.py
+import os
+import re
+import json
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE_PATH = ROOT / "cache" / "weekly_counts.json"
+
+# 確定済みの週の件数を再取得するまでの日数 (PubMed へのインデックス遅延を吸収するため)
+DEFAULT_TTL_DAYS = 30
+
+
+# PubMed の Boolean 演算子 (大文字のみ演算子として扱われる) と括弧
+BOOLEAN_OPERATOR = re.compile(r"\b(?:AND|OR|NOT)\b|[()]")
+
+
+def normalize_query(keywords: list[str]) -> str:
+    """キーワードリストをキャッシュキー用に正規化する
+
+    余分な空白は区別しない。大文字小文字は区別する (PubMed は大文字の AND / OR / NOT だけを演算子として扱うため、
+    "a OR b" と "a or b" はヒット件数が異なる)。
+    キーワードは AND で結合されるため順序も区別しないが、演算子・括弧を含むキーワードがある場合は
+    左から順に評価される結果が変わりうるため並べ替えない。
+    """
+    terms = [" ".join(k.split()) for k in keywords if k.strip()]
+    if not any(BOOLEAN_OPERATOR.search(term) for term in terms):
+        terms.sort()
+    return " AND ".join(terms)
+
+
+class WeeklyCountCache:
+    """週ごとの PubMed ヒット件数を保存する永続キャッシュ (JSONファイル)
+
+    キーは (正規化クエリ, 週の開始日, 週の終了日)。終了日が今日より前の「確定済み」の週のみを保存し、
+    取得から ttl_days 日を過ぎたエントリは期限切れとして扱う。
+
+    Attributes:
+        path (Path): キャッシュファイルのパス
+        ttl_days (float): エントリの有効日数
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, ttl_days: Optional[float] = None):
+        self.path = Path(path)
+        if ttl_days is None:
+            ttl_days = float(os.getenv("WEEKLY_COUNT_CACHE_TTL_DAYS", DEFAULT_TTL_DAYS))
+        self.ttl_days = ttl_days
+
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def get(self, keywords: list[str], min_date: str, max_date: str) -> Optional[int]:
+        """キャッシュ済みの件数を返す。未登録・期限切れ・未確定の週は None
+
+        Args:
+            keywords (list[str]): 検索キーワードのリスト
+            min_date (str): 週の開始日 (YYYY/MM/DD)
+            max_date (str): 週の終了日 (YYYY/MM/DD)
+        """
+        if not self.is_closed(max_date):
+            return None
+
+        with self._lock:
+            entry = self._entries.get(self._key(keywords, min_date, max_date))
+        if entry is None:
+            return None
+
+        fetched_at = datetime.fromisoformat(entry["fetched_at"])
+        if datetime.now() - fetched_at > timedelta(days=self.ttl_days):
+            return None
+        return entry["count"]
+
+    def put(self, keywords: list[str], min_date: str, max_date: str, count: int) -> None:
+        """件数を登録する（確定済みの週のみ）。ファイルへの書き出しは save() で行う"""
+        if not self.is_closed(max_date):
+            return
+
+        with self._lock:
+            self._entries[self._key(keywords, min_date, max_date)] = {
+                "count": count,
+                "fetched_at": datetime.now().isoformat(timespec="seconds"),
+            }
+
+    def save(self) -> None:
+        """キャッシュをファイルに書き出す"""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(self._entries, ensure_ascii=False), encoding="utf-8")
+            tmp_path.replace(self.path)
+
+    @staticmethod
+    def is_closed(max_date: str) -> bool:
+        """週の終了日が今日より前（＝件数が確定済み）かどうか"""
+        return datetime.strptime(max_date, "%Y/%m/%d").date() < datetime.today().date()
+
+    @staticmethod
+    def _key(keywords: list[str], min_date: str, max_date: str) -> str:
+        return f"{normalize_query(keywords)}|{min_date}|{max_date}"
+
+    def _load(self) -> dict:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            print(f"(WeeklyCountCache) キャッシュを読み込めなかったため破棄します: {self.path}")
+            return {}
+
+
+_default_cache: Optional[WeeklyCountCache] = None
+_default_lock = threading.Lock()
+
+
+def get_count_cache() -> WeeklyCountCache:
+    """プロセス共有の WeeklyCountCache を返す（初回呼び出し時に生成）"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = WeeklyCountCache()
+        return _default_cache
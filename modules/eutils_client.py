@@ -0,0 +1,198 @@
+# eutils_client.py
+import os
+import sys
+import time
+import threading
+from pathlib import Path
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Import modules
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from modules.rate_limiter import TokenBucket
+
+EUTILS_BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+
+# NCBI の利用上限 (リクエスト/秒)
+NCBI_RATE_WITHOUT_KEY = 3
+NCBI_RATE_WITH_KEY = 10
+
+# リトライ対象とするステータスコード (レート制限 / サーバー側エラー)
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class EutilsClient:
+    """PubMed E-utilities へのアクセスを一手に引き受けるHTTPクライアント
+
+    requests.Session を保持して keep-alive のコネクションプールを再利用し、
+    タイムアウトと 429/5xx に対するリトライ（指数バックオフ）を共通化する。
+    全リクエスト（リトライを含む）は送信前にレートリミッターを通過する。
+
+    Attributes:
+        base_url (str): E-utilities のベースURL (スタブサーバーでのテスト時に差し替え可能)
+        timeout (tuple[float, float]): (接続, 読み込み) タイムアウト秒
+        max_retries (int): リトライ回数の上限
+        backoff (float): バックオフの基準秒数 (backoff * 2**attempt 秒待機)
+        limiter (TokenBucket): リクエスト送信を間引くレートリミッター
+        identity (dict): 全リクエストに付与する api_key / tool / email
+        session (requests.Session): コネクションプールを保持するセッション
+    """
+
+    def __init__(
+        self,
+        base_url: str = EUTILS_BASE_URL,
+        timeout: tuple[float, float] = (5.0, 30.0),
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        pool_size: int = 10,
+        limiter: Optional[TokenBucket] = None,
+        api_key: Optional[str] = None,
+        tool: Optional[str] = None,
+        email: Optional[str] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self.identity = ncbi_identity(api_key=api_key, tool=tool, email=email)
+        self.limiter = limiter or get_ncbi_limiter(self.identity.get("api_key"))
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method: str, endpoint: str, params: Optional[dict] = None,
+                data: Optional[dict] = None, stream: bool = False) -> requests.Response:
+        """E-utilities にリクエストを送り、成功したレスポンスを返す
+
+        Args:
+            method (str): HTTPメソッド ("GET" / "POST")
+            endpoint (str): エンドポイント名 (例: "esearch.fcgi")
+            params (dict, optional): クエリパラメータ
+            data (dict, optional): POSTボディ
+            stream (bool, optional): レスポンスボディを逐次読み込むか. Defaults to False.
+
+        Returns:
+            requests.Response: ステータスが成功のレスポンス
+
+        Raises:
+            requests.HTTPError: リトライ上限を超えてもエラーステータスの場合
+            requests.RequestException: 接続エラー / タイムアウトがリトライ上限を超えた場合
+        """
+        url = f"{self.base_url}/{endpoint}"
+        if method == "POST":
+            data = {**self.identity, **(data or {})}
+        else:
+            params = {**self.identity, **(params or {})}
+
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            try:
+                response = self.session.request(
+                    method, url, params=params, data=data,
+                    timeout=self.timeout, stream=stream,
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(self._backoff_delay(attempt))
+                continue
+
+            if response.status_code in RETRY_STATUS and attempt < self.max_retries:
+                delay = self._backoff_delay(attempt, response.headers.get("Retry-After"))
+                response.close()
+                print(f"(EutilsClient) {endpoint} が {response.status_code} を返したため {delay:.1f} 秒後に再試行します。")
+                time.sleep(delay)
+                continue
+
+            response.raise_for_status()
+            return response
+
+    def get(self, endpoint: str, params: Optional[dict] = None, stream: bool = False) -> requests.Response:
+        """GETリクエストを送る"""
+        return self.request("GET", endpoint, params=params, stream=stream)
+
+    def post(self, endpoint: str, data: Optional[dict] = None, stream: bool = False) -> requests.Response:
+        """POSTリクエストを送る (ID リストなど長いパラメータ用)"""
+        return self.request("POST", endpoint, data=data, stream=stream)
+
+    def wait_stats(self) -> dict:
+        """レートリミッターでの待機時間の統計を返す (TokenBucket.stats() を参照)"""
+        return self.limiter.stats()
+
+    def close(self) -> None:
+        """コネクションプールを解放する"""
+        self.session.close()
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """待機秒数を決定する。Retry-After ヘッダ（秒指定）があればそちらを優先する"""
+        if retry_after:
+            try:
+                return max(float(retry_after), 0.0)
+            except ValueError:
+                pass
+        return self.backoff * (2 ** attempt)
+
+
+def ncbi_identity(api_key: Optional[str] = None, tool: Optional[str] = None,
+                  email: Optional[str] = None) -> dict:
+    """E-utilities に付与する識別パラメータを組み立てる
+
+    引数が省略された項目は環境変数 NCBI_API_KEY / NCBI_TOOL / NCBI_EMAIL から読み込む。
+
+    Returns:
+        dict: 値が設定されている項目のみを含む {api_key, tool, email}
+    """
+    identity = {
+        "api_key": api_key or os.getenv("NCBI_API_KEY"),
+        "tool": tool or os.getenv("NCBI_TOOL", "journal_scraper"),
+        "email": email or os.getenv("NCBI_EMAIL"),
+    }
+    return {k: v for k, v in identity.items() if v}
+
+
+# プロセス全体で共有するデフォルトクライアントとレートリミッター (レートごとに1つ)
+_default_client: Optional[EutilsClient] = None
+_default_limiters: dict[int, TokenBucket] = {}
+_client_lock = threading.Lock()
+_limiter_lock = threading.Lock()
+
+
+def get_ncbi_limiter(api_key: Optional[str] = None) -> TokenBucket:
+    """プロセス共有の E-utilities 用レートリミッターを返す
+
+    API キー (引数、省略時は環境変数 NCBI_API_KEY) があれば 10 req/s、なければ 3 req/s に制限する。
+    同じレートのクライアントは同じリミッターを共有する。
+    """
+    rate = NCBI_RATE_WITH_KEY if (api_key or os.getenv("NCBI_API_KEY")) else NCBI_RATE_WITHOUT_KEY
+    with _limiter_lock:
+        if rate not in _default_limiters:
+            _default_limiters[rate] = TokenBucket(rate=rate)
+        return _default_limiters[rate]
+
+
+def get_client() -> EutilsClient:
+    """プロセス共有の EutilsClient を返す（初回呼び出し時に生成）"""
+    global _default_client
+    with _client_lock:
+        if _default_client is None:
+            _default_client = EutilsClient()
+        return _default_client
+
+
+def set_client(client: Optional[EutilsClient]) -> None:
+    """プロセス共有のクライアントを差し替える（スタブサーバーを向けたテスト用）
+
+    Args:
+        client (EutilsClient | None): 新しいクライアント。None の場合は次回 get_client() で再生成
+    """
+    global _default_client
+    with _client_lock:
+        if _default_client is not None and _default_client is not client:
+            _default_client.close()
+        _default_client = client
@@ -2,7 +2,27 @@
 import os
 import json
 import re
+import sys
+import time
+import random
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import httpx
 import google.genai as genai
+from google.genai import types
+
+# Import modules
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from modules.rate_limiter import SlidingWindowLimiter
+from modules.summary_cache import SummaryCache, get_summary_cache
+from modules.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+
+# 要約1件あたりの出力トークン数の見込み (分あたりトークン上限の計算に使用)
+OUTPUT_TOKENS_ESTIMATE = 512
 
 PROMPT_TEMPLATE = """
 次のアブストラクトから以下の5項目を抽出し、各項目に 2-3 文で要約してください。
@@ -24,6 +44,106 @@ PROMPT_TEMPLATE = """
 {abstract}
 """
 
+BATCH_PROMPT_TEMPLATE = """
+次の複数のアブストラクトそれぞれから以下の5項目を抽出し、各項目に 2-3 文で要約してください。
+
+出力は必ず **純粋な JSON 配列（コードブロック不可・前後の説明文禁止）** とし、
+アブストラクト1件につき1要素、"pmid" には各アブストラクトの PMID をそのまま入れてください。
+
+出力形式:
+[
+  {{
+    "pmid": "",
+    "目的": "",
+    "サンプル": "",
+    "解析手法": "",
+    "結果": "",
+    "結論": ""
+  }}
+]
+
+アブストラクト内に記載がない項目は "記載なし" としてください。
+
+{abstracts}
+"""
+
+# 要約の5項目
+SUMMARY_FIELDS = ("目的", "サンプル", "解析手法", "結果", "結論")
+
+# 要約1件分のレスポンススキーマ (response_schema で JSON 出力を強制する)
+SUMMARY_SCHEMA = types.Schema(
+    type=types.Type.OBJECT,
+    properties={field: types.Schema(type=types.Type.STRING) for field in SUMMARY_FIELDS},
+    required=list(SUMMARY_FIELDS),
+    property_ordering=list(SUMMARY_FIELDS),
+)
+
+# バッチ要約のレスポンススキーマ (pmid 付きの要約の配列)
+BATCH_SUMMARY_SCHEMA = types.Schema(
+    type=types.Type.ARRAY,
+    items=types.Schema(
+        type=types.Type.OBJECT,
+        properties={
+            "pmid": types.Schema(type=types.Type.STRING),
+            **{field: types.Schema(type=types.Type.STRING) for field in SUMMARY_FIELDS},
+        },
+        required=["pmid", *SUMMARY_FIELDS],
+        property_ordering=["pmid", *SUMMARY_FIELDS],
+    ),
+)
+
+# リトライ対象とするステータスコード (レート制限 / サーバー側エラー)
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+
+# API エラー時のリトライ回数と、指数バックオフの基準秒数・上限秒数
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF = 2.0
+MAX_BACKOFF = 60.0
+
+# 解析できなかったレスポンスを再リクエストする回数
+DEFAULT_PARSE_RETRIES = 1
+
+# バッチモードの既定値: 1リクエストあたりの最大件数 (1 = バッチなし) と推定入力トークン数の上限
+DEFAULT_MAX_BATCH_SIZE = 1
+DEFAULT_BATCH_TOKEN_BUDGET = 8000
+
+class SummaryBudget:
+    """1回の実行で Gemini に送る要約リクエストのコスト上限
+
+    リクエスト数・推定トークン数のいずれかが上限に達した時点で、以降の要約は行わない。
+    None を指定した項目は無制限として扱う。
+
+    Attributes:
+        max_calls (int | None): リクエスト数の上限
+        max_tokens (int | None): 推定入力トークン数の上限
+        calls (int): 消費済みのリクエスト数
+        tokens (int): 消費済みの推定トークン数
+    """
+
+    def __init__(self, max_calls: int = None, max_tokens: int = None):
+        self.max_calls = max_calls
+        self.max_tokens = max_tokens
+        self.calls = 0
+        self.tokens = 0
+        self._lock = threading.Lock()
+
+    def try_consume(self, tokens: int, calls: int = 1) -> bool:
+        """上限内であればコストを消費して True を返す。超える場合は何もせず False"""
+        with self._lock:
+            if self.max_calls is not None and self.calls + calls > self.max_calls:
+                return False
+            if self.max_tokens is not None and self.tokens + tokens > self.max_tokens:
+                return False
+            self.calls += calls
+            self.tokens += tokens
+            return True
+
+
+def estimate_tokens(text: str) -> int:
+    """テキストのトークン数を概算する（英語で約4文字/トークン）"""
+    return len(text) // 4 + 1
+
+
 def build_prompt(template: str, **kwargs) -> str:
     """指定されたテンプレート文字列の {var} を動的に置換する
 
@@ -37,13 +157,120 @@ def build_prompt(template: str, **kwargs) -> str:
     return template.format(**kwargs)
 
 
-def request_gemini_json(gemini_client, prompt: str, model: str="gemini-2.5-flash"):
+def request_gemini_text(gemini_client, prompt: str, model: str=DEFAULT_MODEL, response_schema=None) -> str:
+    """Geminiにプロンプトを送り、レスポンスのテキストをそのまま返す。
+
+    Args:
+        gemini_client: Geminiクライアントインスタンス
+        prompt (str): APIへ送るプロンプト
+        model (str, optional): 使用するモデル (Defaults to "gemini-2.5-flash")
+        response_schema (types.Schema, optional): 指定した場合は JSON 出力をこのスキーマで強制する
+
+    Returns:
+        str: レスポンスのテキスト
+
+    Raises:
+        Exception: Gemini API のエラーはそのまま送出する
+    """
+    config = None
+    if response_schema is not None:
+        config = types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=response_schema,
+        )
+    response = gemini_client.models.generate_content(model=model, contents=prompt, config=config)
+    return response.text if hasattr(response, "text") else str(response)
+
+
+def request_gemini_text_with_retry(gemini_client, prompt: str, model: str=DEFAULT_MODEL, response_schema=None,
+                                   max_retries: int = DEFAULT_MAX_RETRIES, breaker: CircuitBreaker = None) -> str:
+    """request_gemini_text をリトライ付きで実行する。
+
+    429 / 5xx / 接続エラーのみを再試行し、待機時間は Retry-After (retryDelay) があればそれに従い、
+    なければジッター付きの指数バックオフとする。breaker を渡すと再試行対象の失敗を記録し、
+    ブレーカーが開いている間は Gemini を呼ばずに CircuitOpenError を送出する。
+
+    Args:
+        gemini_client: Geminiクライアントインスタンス
+        prompt (str): APIへ送るプロンプト
+        model (str, optional): 使用するモデル (Defaults to "gemini-2.5-flash")
+        response_schema (types.Schema, optional): 指定した場合は JSON 出力をこのスキーマで強制する
+        max_retries (int, optional): リトライ回数の上限. Defaults to DEFAULT_MAX_RETRIES.
+        breaker (CircuitBreaker, optional): 共有するサーキットブレーカー
+
+    Returns:
+        str: レスポンスのテキスト
+
+    Raises:
+        CircuitOpenError: ブレーカーが開いていて呼び出さなかった場合
+        Exception: 再試行対象外のエラー、またはリトライ上限に達した場合の最後のエラー
+    """
+    for attempt in range(max_retries + 1):
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError("Gemini API が不調のため呼び出しを停止しています。")
+
+        try:
+            raw = request_gemini_text(gemini_client, prompt, model=model, response_schema=response_schema)
+        except Exception as e:
+            retryable = is_retryable_error(e)
+            if breaker is not None:
+                # 再試行対象外のエラー (400 など) はサービス自体は応答しているとみなす
+                if retryable:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            if not retryable or attempt >= max_retries:
+                raise
+            if breaker is not None and breaker.state == "open":
+                raise
+            delay = retry_after_seconds(e) or backoff_delay(attempt)
+            print(f"(request_gemini) {e.__class__.__name__} のため {delay:.1f} 秒後に再試行します ({attempt + 1}/{max_retries})。")
+            time.sleep(delay)
+            continue
+
+        if breaker is not None:
+            breaker.record_success()
+        return raw
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """再試行で回復しうるエラー (429 / 5xx / 接続エラー / タイムアウト) かどうか"""
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return code in RETRYABLE_STATUS
+    return isinstance(error, (httpx.TransportError, ConnectionError, TimeoutError))
+
+
+def retry_after_seconds(error: Exception):
+    """エラーから再試行までの待機秒数 (Retry-After ヘッダ / RetryInfo.retryDelay) を取り出す。無ければ None"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers and headers.get("retry-after"):
+        try:
+            return min(float(headers.get("retry-after")), MAX_BACKOFF)
+        except ValueError:
+            pass
+
+    match = re.search(r"retryDelay['\"]?\s*:\s*['\"](\d+(?:\.\d+)?)s", str(getattr(error, "details", "") or error))
+    return min(float(match.group(1)), MAX_BACKOFF) if match else None
+
+
+def backoff_delay(attempt: int) -> float:
+    """ジッター付き指数バックオフの待機秒数 (DEFAULT_BACKOFF * 2**attempt を上限とする一様乱数)"""
+    return random.uniform(0, min(MAX_BACKOFF, DEFAULT_BACKOFF * (2 ** attempt)))
+
+
+def request_gemini_json(gemini_client, prompt: str, model: str=DEFAULT_MODEL, response_schema=None,
+                        max_retries: int = DEFAULT_MAX_RETRIES, breaker: CircuitBreaker = None):
     """Geminiにプロンプトを送り、レスポンスからJSONを抽出して返す。
 
     Args:
         gemini_client: Geminiクライアントインスタンス
         prompt (str): APIへ送るプロンプト
         model (str, optional): 使用するモデル (Defaults to "gemini-2.5-flash")
+        response_schema (types.Schema, optional): 指定した場合は JSON 出力をこのスキーマで強制する
+        max_retries (int, optional): 429 / 5xx 時のリトライ回数の上限. Defaults to DEFAULT_MAX_RETRIES.
+        breaker (CircuitBreaker, optional): 共有するサーキットブレーカー
 
     Returns:
         dict: Geminiレスポンスから抽出したJSON。抽出できない場合は:
@@ -51,16 +278,24 @@ def request_gemini_json(gemini_client, prompt: str, model: str="gemini-2.5-flash
                 "error": True,
                 "raw_response": "元のレスポンス文字列"
               }
+              サービス不調 (リトライ上限到達・ブレーカー作動) で要約できなかった場合は
+              "deferred": True を付け、後から再要約できるようにする
     """
     try:
-        response = gemini_client.models.generate_content(model=model, contents=prompt)
-        raw = response.text if hasattr(response, "text") else str(response)
+        raw = request_gemini_text_with_retry(
+            gemini_client, prompt, model=model, response_schema=response_schema,
+            max_retries=max_retries, breaker=breaker,
+        )
+    except CircuitOpenError as e:
+        return {"error": True, "deferred": True, "message": str(e)}
     except Exception as e:
+        if is_retryable_error(e):
+            return {"error": True, "deferred": True, "message": f"Gemini API error: {str(e)}"}
         return {"error": True, "message": f"Gemini API error: {str(e)}"}
 
     parsed = extract_json_from_gemini(raw)
 
-    if parsed is None:
+    if not isinstance(parsed, dict):
         return {
             "error": True,
             "raw_response": raw
@@ -69,59 +304,377 @@ def request_gemini_json(gemini_client, prompt: str, model: str="gemini-2.5-flash
     return parsed
 
 
-def summarize_dict(gemini_client, data_dict):
-    """辞書形式のデータを順に要約して同一キーの辞書形式で返す
+def build_batch_prompt(abstracts: dict[str, str]) -> str:
+    """複数のアブストラクトを1つのバッチ要約プロンプトにまとめる
+
+    Args:
+        abstracts (dict[str, str]): {pmid: abstract_text}
+
+    Returns:
+        str: BATCH_PROMPT_TEMPLATE から作ったプロンプト
+    """
+    blocks = "\n".join(f"【PMID: {pmid}】\n{abstract}\n" for pmid, abstract in abstracts.items())
+    return build_prompt(BATCH_PROMPT_TEMPLATE, abstracts=blocks)
+
+
+def parse_batch_response(raw: str, pmids: list[str]) -> dict:
+    """バッチ要約のレスポンスを PMID ごとの要約に分割する
+
+    Args:
+        raw (str): Gemini のレスポンステキスト (JSON 配列)
+        pmids (list[str]): バッチに含めた PMID
+
+    Returns:
+        dict: {pmid: summary}。対応する要素が無い・5項目が揃っていない PMID は None
+    """
+    items = extract_json_from_gemini(raw)
+
+    parsed = {}
+    if isinstance(items, list):
+        for item in items:
+            if not isinstance(item, dict) or not all(field in item for field in SUMMARY_FIELDS):
+                continue
+            parsed[str(item.get("pmid", "")).strip()] = {field: item[field] for field in SUMMARY_FIELDS}
+
+    return {pmid: parsed.get(pmid) for pmid in pmids}
+
+
+def summarize_dict(gemini_client, data_dict, max_workers: int = 4):
+    """辞書形式のデータを並行に要約して同一キーの辞書形式で返す
     Args:
         gemini_client: Geminiクライアントインスタンス
         data_dict (dict): {key: text}形式の辞書データ
+        max_workers (int, optional): 同時に実行するリクエスト数. Defaults to 4.
     Returns:
-        dict: {key: summary}形式の要約辞書
+        dict: {key: summary}形式の要約辞書 (data_dict と同じキー順)
     """
-    summaries = {}
+    engine = SummaryEngine(gemini_client, max_workers=max_workers, use_cache=False, response_schema=None)
+    return engine.summarize_prompts(data_dict)
+
+
+class SummaryEngine:
+    """Gemini への要約リクエストを並行に実行するエンジン
+
+    スレッドプールで最大 max_workers 件を同時に送り、分あたりのリクエスト数・トークン数の
+    上限 (rpm / tpm) は直近60秒の送信数 (スライディングウィンドウ) で守る。結果は入力と同じキー順の辞書で返す。
+    1回の実行の間は同じインスタンスを使い回すことで、上限と budget が実行全体に掛かる。
+    要約済みのアブストラクトは SummaryCache から返し、Gemini には送らない。
+
+    max_batch_size が2以上の場合はバッチモードとなり、複数のアブストラクトを1リクエストに
+    まとめる。1バッチの件数は推定入力トークン数が batch_token_budget に収まるよう調整し、
+    レスポンスから取り出せなかった PMID だけを1件ずつ再リクエストする。
 
-    for key, text in data_dict.items():
-        summaries[key] = request_gemini_json(gemini_client, text)
+    429 / 5xx はバックオフ付きで再試行し、失敗が続いてサーキットブレーカーが開いた後の論文は
+    Gemini を呼ばずに "deferred" として返す（deferred に PMID を記録し、後で再要約できる）。
 
-    return summaries
+    出力は response_schema で JSON に制約し、それでも解析できなかった（5項目が揃わない）
+    レスポンスは parse_retries 回まで再リクエストする。解析失敗の回数は parse_failures に記録する。
+
+    Attributes:
+        gemini_client: Geminiクライアントインスタンス
+        max_workers (int): 同時に実行するリクエスト数
+        model (str): 使用するモデル
+        template (str): アブストラクトから要約プロンプトを作るテンプレート
+        budget (SummaryBudget | None): 実行全体のコスト上限
+        cache (SummaryCache | None): 要約キャッシュ
+        max_batch_size (int): 1リクエストにまとめるアブストラクト数の上限
+        batch_token_budget (int): 1バッチの推定入力トークン数の上限
+        response_schema (types.Schema | None): 要約1件分のレスポンススキーマ (None で制約なし)
+        parse_retries (int): 解析できなかったレスポンスを再リクエストする回数
+        parse_failures (int): 解析できなかったレスポンスの数
+        max_retries (int): 429 / 5xx 時のリトライ回数の上限
+        breaker (CircuitBreaker): Gemini の不調を検知するサーキットブレーカー
+        deferred (list[str]): サービス不調で要約を後回しにした PMID
+    """
+
+    def __init__(self, gemini_client, max_workers: int = None, rpm: float = None, tpm: float = None,
+                 model: str = DEFAULT_MODEL, template: str = PROMPT_TEMPLATE, budget: SummaryBudget = None,
+                 cache: SummaryCache = None, use_cache: bool = True,
+                 max_batch_size: int = None, batch_token_budget: int = None,
+                 response_schema=SUMMARY_SCHEMA, parse_retries: int = DEFAULT_PARSE_RETRIES,
+                 max_retries: int = None, breaker: CircuitBreaker = None):
+        self.gemini_client = gemini_client
+        self.max_workers = max_workers or int(os.getenv("GEMINI_MAX_WORKERS", 4))
+        self.model = model
+        self.template = template
+        self.budget = budget
+        self.cache = (cache or get_summary_cache()) if use_cache else None
+        self.max_batch_size = max_batch_size or int(os.getenv("GEMINI_MAX_BATCH_SIZE", DEFAULT_MAX_BATCH_SIZE))
+        self.batch_token_budget = batch_token_budget or int(
+            os.getenv("GEMINI_BATCH_TOKEN_BUDGET", DEFAULT_BATCH_TOKEN_BUDGET)
+        )
+
+        self.response_schema = response_schema
+        self.parse_retries = parse_retries
+        self.parse_failures = 0
+        self.max_retries = max_retries if max_retries is not None else int(
+            os.getenv("GEMINI_MAX_RETRIES", DEFAULT_MAX_RETRIES)
+        )
+        self.breaker = breaker or CircuitBreaker()
+        self.deferred = []
+        self._metrics_lock = threading.Lock()
+
+        rpm = rpm or _env_float("GEMINI_RPM")
+        tpm = tpm or _env_float("GEMINI_TPM")
+        # 直近60秒の送信数で制限する (トークンバケットではバースト分と補充分で1分に上限の2倍まで送れてしまう)
+        self._quota = SlidingWindowLimiter(max_requests=rpm, max_tokens=tpm, window=60.0) if rpm or tpm else None
+
+    def summarize(self, abstracts: dict[str, str]) -> dict:
+        """アブストラクトを要約する
+
+        アブストラクトが無いものは "No abstract exists."、budget を超えたものはエラー扱いの要約を返す。
+
+        Args:
+            abstracts (dict[str, str]): {pmid: abstract_text}
+
+        Returns:
+            dict: {pmid: summary} (abstracts と同じキー順)
+        """
+        summaries = {}
+        pending = {}
+        for pmid, abstract in abstracts.items():
+            if not abstract or abstract == "N/A" or not abstract.strip():
+                summaries[pmid] = "No abstract exists."
+                continue
+
+            cached = self.cache.get(abstract, self.template, self.model) if self.cache else None
+            if cached is not None:
+                summaries[pmid] = cached
+                continue
+
+            summaries[pmid] = None  # キー順を入力どおりに保つための仮置き
+            pending[pmid] = abstract
+
+        # バッチごとにプロンプトを作り、budget の範囲内のものだけを送る
+        jobs = []
+        skipped = []
+        for batch in self._plan_batches(pending):
+            prompt = self._build_prompt(batch)
+            if self._consume_budget(prompt):
+                jobs.append((batch, prompt))
+            else:
+                skipped.extend(batch)
+
+        results = self._run_jobs(jobs)
+
+        # バッチのレスポンスから取り出せなかったものだけを1件ずつ再リクエストする
+        failed = [pmid for pmid, summary in results.items() if summary is None]
+        if failed:
+            print(f"(SummaryEngine) バッチ要約から {len(failed)} 件を取り出せなかったため個別に再リクエストします。")
+            retry_prompts = {}
+            for pmid in failed:
+                prompt = build_prompt(self.template, abstract=pending[pmid])
+                if self._consume_budget(prompt):
+                    retry_prompts[pmid] = prompt
+                else:
+                    skipped.append(pmid)
+                    del results[pmid]
+            results.update(self.summarize_prompts(retry_prompts))
+
+        for pmid in skipped:
+            results[pmid] = {"error": True, "message": "要約コストの上限に達したため要約をスキップしました。"}
+        if skipped:
+            print(f"(SummaryEngine) 要約コストの上限により {len(skipped)} 件の要約をスキップしました。")
+
+        summaries.update(results)
+
+        deferred = [pmid for pmid, summary in results.items() if isinstance(summary, dict) and summary.get("deferred")]
+        if deferred:
+            self.deferred.extend(deferred)
+            print(f"(SummaryEngine) Gemini の不調 (または再リクエスト分の要約コストの不足) により {len(deferred)} 件の要約を後回しにしました。")
+
+        if self.cache:
+            for pmid, abstract in pending.items():
+                self.cache.put(abstract, self.template, self.model, summaries[pmid])
+            # 新しい要約とヒットしたエントリの最終利用時刻だけを追記する
+            self.cache.save()
+
+        return summaries
+
+    def summarize_prompts(self, prompts: dict[str, str]) -> dict:
+        """プロンプトをそのまま並行に Gemini へ送り、JSON を抽出して返す
+
+        Args:
+            prompts (dict[str, str]): {key: prompt}
+
+        Returns:
+            dict: {key: request_gemini_json の結果} (prompts と同じキー順)
+        """
+        if not prompts:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {key: executor.submit(self._request, prompt) for key, prompt in prompts.items()}
+            return {key: future.result() for key, future in futures.items()}
+
+    def _plan_batches(self, abstracts: dict[str, str]) -> list[dict]:
+        """アブストラクトを件数とトークン数の上限に収まるバッチに分ける（長いものほど少ない件数になる）"""
+        batches = []
+        batch, batch_tokens = {}, 0
+        for pmid, abstract in abstracts.items():
+            tokens = estimate_tokens(abstract)
+            if batch and (len(batch) >= self.max_batch_size or batch_tokens + tokens > self.batch_token_budget):
+                batches.append(batch)
+                batch, batch_tokens = {}, 0
+            batch[pmid] = abstract
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _build_prompt(self, batch: dict[str, str]) -> str:
+        """1件なら通常のプロンプト、複数件ならバッチプロンプトを作る"""
+        if len(batch) == 1:
+            return build_prompt(self.template, abstract=next(iter(batch.values())))
+        return build_batch_prompt(batch)
+
+    def _consume_budget(self, prompt: str) -> bool:
+        """budget の範囲内であれば1リクエスト分を消費して True を返す"""
+        return self.budget is None or self.budget.try_consume(estimate_tokens(prompt))
+
+    def _run_jobs(self, jobs: list[tuple[dict, str]]) -> dict:
+        """(バッチ, プロンプト) を並行に実行し、{pmid: summary} を返す（取り出せなかった PMID は None）"""
+        if not jobs:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [(batch, executor.submit(self._run_job, batch, prompt)) for batch, prompt in jobs]
+            results = {}
+            for batch, future in futures:
+                results.update(future.result())
+            return results
+
+    def _run_job(self, batch: dict[str, str], prompt: str) -> dict:
+        """1リクエスト分のバッチを要約する"""
+        pmids = list(batch)
+        if len(pmids) == 1:
+            return {pmids[0]: self._request(prompt)}
+
+        if self.breaker.state == "open":
+            return {pmid: _deferred_summary() for pmid in pmids}
+
+        schema = BATCH_SUMMARY_SCHEMA if self.response_schema is not None else None
+        self._acquire_quota(prompt, n_items=len(pmids))
+        try:
+            raw = request_gemini_text_with_retry(
+                self.gemini_client, prompt, model=self.model, response_schema=schema,
+                max_retries=self.max_retries, breaker=self.breaker,
+            )
+        except Exception as e:
+            print(f"(SummaryEngine) バッチ要約に失敗しました: {e}")
+            if isinstance(e, CircuitOpenError) or is_retryable_error(e):
+                return {pmid: _deferred_summary() for pmid in pmids}
+            return {pmid: None for pmid in pmids}
+
+        results = parse_batch_response(raw, pmids)
+        self._count_parse_failures(sum(1 for summary in results.values() if summary is None))
+        return results
+
+    def _request(self, prompt: str):
+        """分あたりの上限を守って1件リクエストする。解析できなければ parse_retries 回まで再リクエストする
+
+        再リクエストしても解析できなかった場合は {"error": True, "raw_response": ...} を返す。
+        1回目の budget は呼び出し元で消費済みとし、再リクエストの分はここで budget から消費する。
+        budget を使い切った場合は再リクエストせず後回しにする。
+        """
+        # ブレーカーが開いている間はレート制限の待機もせずに後回しにする
+        if self.breaker.state == "open":
+            return _deferred_summary()
+
+        for attempt in range(self.parse_retries + 1):
+            if attempt and not self._consume_budget(prompt):
+                print("(SummaryEngine) 要約コストの上限に達したため再リクエストせずに後回しにします。")
+                return _deferred_summary("要約コストの上限に達したため、解析できなかったレスポンスの再リクエストを後回しにしました。")
+            self._acquire_quota(prompt)
+            result = request_gemini_json(
+                self.gemini_client, prompt, model=self.model, response_schema=self.response_schema,
+                max_retries=self.max_retries, breaker=self.breaker,
+            )
+            if not self._is_parse_failure(result):
+                return result
+            self._count_parse_failures(1)
+        if not result.get("error"):
+            # 再リクエストしても項目が揃わなかった要約はエラーとして返す (要約キャッシュに登録せず、次回に要約し直す)
+            return {"error": True, "raw_response": json.dumps(result, ensure_ascii=False)}
+        return result
+
+    def _is_parse_failure(self, result: dict) -> bool:
+        """レスポンスが解析できなかった（スキーマ指定時は5項目が揃っていない）かどうか"""
+        if result.get("error"):
+            return "raw_response" in result
+        if self.response_schema is None:
+            return False
+        return not all(field in result for field in SUMMARY_FIELDS)
+
+    def _count_parse_failures(self, n: int) -> None:
+        if n:
+            with self._metrics_lock:
+                self.parse_failures += n
+
+    def _acquire_quota(self, prompt: str, n_items: int = 1) -> None:
+        """分あたりのリクエスト数・トークン数の上限に達していれば待機する"""
+        if self._quota:
+            self._quota.acquire(estimate_tokens(prompt) + OUTPUT_TOKENS_ESTIMATE * n_items)
+
+    def parse_stats(self) -> dict:
+        """レスポンスの解析失敗数を返す"""
+        with self._metrics_lock:
+            return {"parse_failures": self.parse_failures}
+
+    def cache_stats(self) -> dict:
+        """要約キャッシュのヒット/ミス数を返す (キャッシュ無効時は None)"""
+        return self.cache.stats() if self.cache else None
+
+    def wait_stats(self) -> dict:
+        """分あたりの上限による待機時間の統計を返す (上限を設定していなければ None)"""
+        return self._quota.stats() if self._quota else None
+
+
+def _deferred_summary(message: str = "Gemini API が不調のため要約を後回しにしました。") -> dict:
+    """サービス不調 (または再リクエスト分の要約コストの不足) で後回しにした論文の要約"""
+    return {"error": True, "deferred": True, "message": message}
+
+
+def _env_float(name: str):
+    """環境変数を float として読み込む（未設定なら None）"""
+    value = os.getenv(name)
+    return float(value) if value else None
 
 def extract_json_from_gemini(text: str):
-    """Geminiの出力からJSONを安全に抽出してdictで返す。
-    Geminiの出力は必ずしも純粋なJSONではないため、複数のパターンに対応するためのフォーマット検出
+    """Geminiの出力からJSONを抽出して返す。
+
+    response_schema を指定したレスポンスは純粋な JSON のため、まずそのままデコードする (高速パス)。
+    失敗した場合はコードブロックや前後の説明文を想定し、最初の "{" または "[" から
+    JSON を1回だけデコードする (文字列の線形走査1回)。
 
     Args:
         text (str): Geminiの出力テキスト
     Returns:
-        dict or None: 抽出したJSONデータ、または None
+        dict | list | None: 抽出したJSONデータ、または None
     """
 
     if not text:
         return None
 
-    # 1) ```json ... ``` のようなコードブロックがある場合
-    codeblock_match = re.search(r"```json(.*?)```", text, re.DOTALL)
-    if codeblock_match:
-        try:
-            return json.loads(codeblock_match.group(1).strip())
-        except:
-            pass
-
-    # 2) 通常の { ... } の JSON を正規表現で抽出
-    json_match = re.search(r"\{[\s\S]*\}", text)
-    if json_match:
-        try:
-            return json.loads(json_match.group(0))
-        except:
-            pass
+    # 1) 高速パス: レスポンス全体が JSON
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
 
-    # 3) fallback：最初の { から最後の } までを抽出
+    # 2) フォールバック: 最初の { / [ から始まる JSON 値を取り出す
+    match = re.search(r"[\[{]", text)
+    if match is None:
+        return None
     try:
-        start = text.index("{")
-        end = text.rindex("}") + 1
-        return json.loads(text[start:end])
-    except:
+        value, _ = _JSON_DECODER.raw_decode(text, match.start())
+        return value
+    except json.JSONDecodeError:
         return None
 
 
+_JSON_DECODER = json.JSONDecoder()
+
 
 # ---------------------------
 # ここからメイン関数
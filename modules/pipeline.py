@@ -0,0 +1,60 @@
+# pipeline.py
+import queue
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# 先読みしてキューに溜めておく要素数の上限 (これを超えると生産側が待つ)
+DEFAULT_PREFETCH_DEPTH = 2
+
+_DONE = object()
+
+
+def prefetch(iterable: Iterable[T], depth: int = DEFAULT_PREFETCH_DEPTH) -> Iterator[T]:
+    """iterable を別スレッドで先読みしながら順に返すジェネレータ
+
+    生産側 (例: PubMed からの取得) と消費側 (例: Gemini による要約) を並行に動かす。
+    キューは depth 件までの有界キューで、消費が追いつかない間は生産側が待機する（バックプレッシャー）。
+    生産側で発生した例外は消費側で再送出する。消費側が途中で終了した場合は生産側も停止する。
+
+    Args:
+        iterable (Iterable): 先読みする要素の列
+        depth (int, optional): 先読みする要素数の上限. Defaults to DEFAULT_PREFETCH_DEPTH.
+
+    Yields:
+        iterable の要素（元の順序のまま）
+    """
+    items = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((_DONE, None))
+        except BaseException as e:
+            put((_DONE, e))
+
+    thread = threading.Thread(target=produce, name="prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
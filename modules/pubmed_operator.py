@@ -1,8 +1,17 @@
-import requests
+import io
+import sys
 import xml.etree.ElementTree as ET
 import re
+from pathlib import Path
 from datetime import datetime, timedelta
 from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+
+# Import modules
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from modules.eutils_client import EutilsClient, get_client
+from modules.count_cache import get_count_cache
 
 def calculate_date_range(mindate=None, maxdate=None, days=None): 
     """ 検索期間の計算
@@ -42,17 +51,30 @@ def calculate_date_range(mindate=None, maxdate=None, days=None):
 
     return mindate_str, maxdate_str
 
-def fetch_esearch(keywords:list[str], min_date, max_date, retmax=100):
+# ESearch で retstart により取得できる件数の上限 (これを超える分は History サーバー経由で取得する)
+ESEARCH_MAX_RESULTS = 9999
+# EFetch (rettype=uilist) 1リクエストで取得する論文IDの件数
+UILIST_PAGE_SIZE = 10000
+
+def fetch_esearch(keywords:list[str], min_date, max_date, retmax=100, client: Optional[EutilsClient] = None,
+                  retstart: int = 0):
     '''PubMedでキーワードと日付に基づいて論文IDを検索する関数
     Args:
         keywords (list[str]): 検索キーワードのリスト
         min_date (str): 検索日付 (YYYY/MM/DD)
         Max_date (str): 検索日付 (YYYY/MM/DD)
         retmax (int, optional): 取得する最大論文数. Defaults to 100.
+        client (EutilsClient, optional): 使用するクライアント. Defaults to 共有クライアント.
+        retstart (int, optional): 取得開始位置 (ページング用). Defaults to 0.
     Returns:
         list[str]: 検索で取得した論文IDのリスト
     '''
-    search_url = 'https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi'
+    return _esearch_page(keywords, min_date, max_date, retmax, retstart, client)[0]
+
+def _esearch_page(keywords: list[str], min_date, max_date, retmax: int, retstart: int,
+                  client: Optional[EutilsClient] = None) -> tuple[list[str], int]:
+    """ESearch を1ページ分実行し、(論文IDのリスト, ヒット件数) を返す"""
+    client = client or get_client()
     query = ' AND '.join(keywords)
 
     search_params = {
@@ -61,30 +83,70 @@ def fetch_esearch(keywords:list[str], min_date, max_date, retmax=100):
         'mindate': min_date,
         'maxdate': max_date,
         'retmode': 'xml',
+        'retstart': retstart,
         'retmax': retmax
     }
-    response = requests.get(search_url, params=search_params)
+    response = client.get('esearch.fcgi', params=search_params)
     pmids = re.findall(r'<Id>(\d+)</Id>', response.text)
+    count = re.search(r'<Count>(\d+)</Count>', response.text)
+    return pmids, int(count.group(1)) if count else len(pmids)
+
+def fetch_esearch_all(keywords: list[str], min_date, max_date, page_size: int = 500,
+                      limit: Optional[int] = None, client: Optional[EutilsClient] = None) -> list[str]:
+    """ESearch を retstart でページングし、ヒットした論文IDをすべて取得する
+
+    ESearch は retstart で ESEARCH_MAX_RESULTS 件までしか取得できないため、ヒット件数が
+    それを超える場合は検索結果を History サーバーに保存し、EFetch (rettype=uilist) で論文IDを取得する。
+
+    Args:
+        keywords (list[str]): 検索キーワードのリスト
+        min_date (str): 検索開始日 (YYYY/MM/DD)
+        max_date (str): 検索終了日 (YYYY/MM/DD)
+        page_size (int, optional): 1ページあたりの取得件数. Defaults to 500.
+        limit (int, optional): 取得件数の上限. Defaults to None (無制限).
+        client (EutilsClient, optional): 使用するクライアント. Defaults to 共有クライアント.
+
+    Returns:
+        list[str]: 論文IDのリスト
+    """
+    client = client or get_client()
+    retmax = page_size if limit is None else min(page_size, limit)
+    pmids, count = _esearch_page(keywords, min_date, max_date, retmax, 0, client)
+    total = count if limit is None else min(count, limit)
+
+    if total > ESEARCH_MAX_RESULTS:
+        print(f"(fetch_esearch_all) ヒット件数 {count} 件が ESearch の上限を超えるため History サーバー経由で取得します。")
+        history = fetch_esearch_history(keywords, min_date, max_date, client=client)
+        return fetch_history_pmids(history, limit=limit, client=client)
+
+    while len(pmids) < total:
+        page = fetch_esearch(keywords, min_date, max_date, retmax=min(page_size, total - len(pmids)),
+                             client=client, retstart=len(pmids))
+        if not page:
+            break
+        pmids.extend(page)
     return pmids
 
-def fetch_esummary(pmids:list[str]) -> str:
+def fetch_esummary(pmids:list[str], client: Optional[EutilsClient] = None) -> str:
     '''PubMedで論文IDに基づいて論文情報を取得する関数
     Args:
         ids (list[str]): 論文IDのリスト
+        client (EutilsClient, optional): 使用するクライアント. Defaults to 共有クライアント.
     Returns:
         str: 論文情報を含むXML文字列
     '''
     if not pmids:
         return 'No results found.'
 
-    summary_url = 'https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi'
+    client = client or get_client()
     summary_params = {
         'db': 'pubmed',
         'id': ','.join(pmids),
         'retmode': 'xml'
     }
 
-    response = requests.get(summary_url, params=summary_params)
+    # ID リストが長くなっても URL 長の上限に掛からないよう POST で送る
+    response = client.post('esummary.fcgi', data=summary_params)
     return response.text
 
 def parse_esummary_xml(xml_data:str) -> list[dict]:
@@ -134,96 +196,386 @@ def doi_to_url(doi: str) -> str:
     return f"https://doi.org/{doi}"
 
 
-def fetch_eFetch(pmids: List[str]) -> dict[str, str]:
+def fetch_eFetch(pmids: List[str], client: Optional[EutilsClient] = None) -> dict[str, str]:
     """ PubMedから論文のアブストラクトを取得する関数
     Args:
         pmids (list[str]): 論文IDのリスト
+        client (EutilsClient, optional): 使用するクライアント. Defaults to 共有クライアント.
     Returns:
         dict[str, str]: {pmid: abstract_text}
     """
     if not pmids:
         return {}
 
-    efetch_url = (
-        "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi?"
-        "db=pubmed&retmode=xml&id=" + ",".join(pmids)
-    )
+    client = client or get_client()
+    efetch_params = {
+        "db": "pubmed",
+        "retmode": "xml",
+        "id": ",".join(pmids),
+    }
 
-    response = requests.get(efetch_url)
-    response.raise_for_status()
+    # ID リストが長くなっても URL 長の上限に掛からないよう POST で送る
+    response = client.post("efetch.fcgi", data=efetch_params)
+    return parse_efetch_xml(response.content)
 
-    root = ET.fromstring(response.content)
+def parse_efetch_xml(xml_data) -> dict[str, str]:
+    """ EFetch の XML データからアブストラクトを抽出する関数
+
+    Args:
+        xml_data (str | bytes): fetch_eFetch で取得した XML データ
 
-    abstracts = {}
+    Returns:
+        dict[str, str]: {pmid: abstract_text}
+    """
+    return {paper["pmid"]: paper["abstract"] for paper in parse_pubmed_articles(xml_data)}
+
+def fetch_papers(pmids: List[str], client: Optional[EutilsClient] = None) -> list[dict]:
+    """ EFetch 1回で論文のメタデータとアブストラクトをまとめて取得する関数
+
+    PubmedArticle XML にはタイトル・出版日・DOI も含まれるため、ESummary は呼ばない。
+    レスポンスはストリームのまま iter_pubmed_articles で逐次パースする。
+
+    Args:
+        pmids (list[str]): 論文IDのリスト
+        client (EutilsClient, optional): 使用するクライアント. Defaults to 共有クライアント.
+    Returns:
+        list[dict]: parse_pubmed_articles 形式の論文レコードのリスト
+    """
+    if not pmids:
+        return []
+
+    client = client or get_client()
+    efetch_params = {
+        "db": "pubmed",
+        "retmode": "xml",
+        "id": ",".join(pmids),
+    }
+    with client.post("efetch.fcgi", data=efetch_params, stream=True) as response:
+        response.raw.decode_content = True
+        return list(iter_pubmed_articles(response.raw))
+
+def parse_pubmed_articles(xml_data) -> list[dict]:
+    """ EFetch の PubmedArticle XML から論文レコードを抽出する関数
 
-    for article in root.findall(".//PubmedArticle"):
-        pmid_elem = article.find(".//PMID")
-        pmid = pmid_elem.text if pmid_elem is not None else None
+    Args:
+        xml_data (str | bytes): EFetch で取得した XML データ
 
-        abstract_elem = article.find(".//Abstract/AbstractText")
-        abstract_text = (
-            abstract_elem.text if abstract_elem is not None else "N/A"
+    Returns:
+        list[dict]: {"pmid", "title", "pubdate", "url", "abstract", "abstract_sections"} のリスト (XML 内の順)
+    """
+    if isinstance(xml_data, str):
+        xml_data = xml_data.encode("utf-8")
+    return list(iter_pubmed_articles(io.BytesIO(xml_data)))
+
+def iter_pubmed_articles(source):
+    """ EFetch の XML ストリームを iterparse で逐次パースし、論文レコードを1件ずつ返すジェネレータ
+
+    PubmedArticle の終了タグごとにレコードを生成し、処理済みの要素はすぐに破棄するため、
+    バッチサイズが大きくなってもメモリ使用量は論文1件分程度に保たれる。
+
+    Args:
+        source: XML を読み出せるファイルライクオブジェクト (response.raw など) またはファイルパス
+
+    Yields:
+        dict: {"pmid", "title", "pubdate", "url", "abstract", "abstract_sections"}
+    """
+    root = None
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            continue
+
+        if elem.tag != "PubmedArticle":
+            continue
+
+        paper = _article_record(elem)
+        # 処理済みの記事をツリーから切り離して解放する
+        root.clear()
+        if paper["pmid"]:
+            yield paper
+
+def _article_record(article: ET.Element) -> dict:
+    """ PubmedArticle 要素1件分を論文レコードに変換する"""
+    pmid = article.findtext(".//MedlineCitation/PMID")
+
+    title_elem = article.find(".//Article/ArticleTitle")
+    title = "".join(title_elem.itertext()).strip() if title_elem is not None else ""
+
+    # ESummary の PubDate と同じ "2025 Dec 5" 形式に揃える
+    pubdate_elem = article.find(".//Article/Journal/JournalIssue/PubDate")
+    pubdate = ""
+    if pubdate_elem is not None:
+        pubdate = pubdate_elem.findtext("MedlineDate") or " ".join(
+            pubdate_elem.findtext(tag) for tag in ("Year", "Month", "Day") if pubdate_elem.findtext(tag)
         )
 
-        if pmid:
-            abstracts[pmid] = abstract_text
+    doi_raw = article.findtext('.//Article/ELocationID[@EIdType="doi"]') \
+        or article.findtext('.//PubmedData/ArticleIdList/ArticleId[@IdType="doi"]')
+    url = doi_to_url(extract_doi(doi_raw))
+
+    sections = parse_abstract_sections(article)
 
-    return abstracts
+    return {
+        "pmid": pmid,
+        "title": title,
+        "pubdate": pubdate,
+        "url": url,
+        "abstract": join_abstract_sections(sections),
+        "abstract_sections": sections,
+    }
+
+# 要約に使わない構造化アブストラクトのセクション (Label 属性)
+SUMMARY_SKIP_LABELS = re.compile(
+    r"(?:CLINICAL )?TRIAL REGISTRATIONS?|(?:STUDY )?REGISTRATION|FUNDING|KEY ?WORDS?|LEVEL OF EVIDENCE"
+    r"|CONFLICTS? OF INTEREST|DISCLOSURES?|COPYRIGHT",
+    re.IGNORECASE,
+)
+
+def parse_abstract_sections(article: ET.Element) -> list[dict]:
+    """ PubmedArticle 要素から AbstractText をすべて抽出する
+
+    構造化アブストラクト (BACKGROUND / METHODS / RESULTS / CONCLUSIONS など) は
+    セクションごとに1要素となる。<i> や <sup> などのインライン要素内のテキストも含める。
 
-def fetch_weekly_counts(keywords: list[str], weeks: int = 12):
+    Args:
+        article (ET.Element): PubmedArticle 要素
+
+    Returns:
+        list[dict]: {"label": Label属性, "category": NlmCategory属性, "text": 本文} のリスト
     """
-    過去N週間分を1週間単位で区切って PubMed のヒット件数を返す。
-    
+    sections = []
+    for elem in article.findall(".//Abstract/AbstractText"):
+        text = " ".join("".join(elem.itertext()).split())
+        if not text:
+            continue
+        sections.append({
+            "label": elem.get("Label", ""),
+            "category": elem.get("NlmCategory", ""),
+            "text": text,
+        })
+    return sections
+
+def join_abstract_sections(sections: list[dict]) -> str:
+    """ アブストラクトのセクションを "LABEL: 本文" 形式で改行区切りに結合する。セクションが無ければ 'N/A'"""
+    if not sections:
+        return "N/A"
+    return "\n".join(
+        f"{section['label']}: {section['text']}" if section["label"] else section["text"]
+        for section in sections
+    )
+
+def summary_abstract(paper: dict) -> str:
+    """ 要約 (Gemini) に送るアブストラクト
+
+    構造化アブストラクトは、要約の5項目 (目的・サンプル・解析手法・結果・結論) のどれにも使わない
+    セクション (試験登録・資金・キーワードなど) を除いて結合する。
+    結果JSONの論文エントリ (abstract_sections を保存しない) は、結合済みの abstract の行 ("LABEL: 本文") を
+    同じ基準で除くため、保存済みの結果から再要約しても初回と同じ入力 (要約キャッシュのキー) になる。
+    """
+    sections = paper.get("abstract_sections")
+    if sections is None:
+        lines = (paper.get("abstract") or "N/A").split("\n")
+        kept = [line for line in lines if ": " not in line or not SUMMARY_SKIP_LABELS.match(line.split(": ", 1)[0])]
+        return "\n".join(kept or lines)
+    if not sections:
+        return paper.get("abstract") or "N/A"
+    kept = [section for section in sections if not SUMMARY_SKIP_LABELS.match(section["label"])]
+    return join_abstract_sections(kept or sections)
+
+def fetch_esearch_history(keywords: list[str], min_date, max_date, client: Optional[EutilsClient] = None) -> dict:
+    """ESearch を usehistory=y で実行し、検索結果を NCBI の History サーバーに保存する
+
     Args:
         keywords (list[str]): 検索キーワードのリスト
-        weeks (int): 遡る週数（デフォルト12週間）
-    
+        min_date (str): 検索開始日 (YYYY/MM/DD)
+        max_date (str): 検索終了日 (YYYY/MM/DD)
+        client (EutilsClient, optional): 使用するクライアント. Defaults to 共有クライアント.
+
     Returns:
-        dict: { "YYYY/MM/DD": int } 各週の開始日のヒット件数
+        dict: {"count": ヒット件数, "webenv": WebEnv, "query_key": query_key}
     """
-    today = datetime.today()
-    start_date = today - timedelta(weeks=weeks)
+    client = client or get_client()
+    search_params = {
+        'db': 'pubmed',
+        'term': ' AND '.join(keywords),
+        'mindate': min_date,
+        'maxdate': max_date,
+        'retmode': 'xml',
+        'retmax': 0,  # ID は History サーバー側に保持するので受け取らない
+        'usehistory': 'y',
+    }
+    response = client.get('esearch.fcgi', params=search_params)
+
+    root = ET.fromstring(response.content)
+    return {
+        "count": int(root.findtext("Count", default="0")),
+        "webenv": root.findtext("WebEnv"),
+        "query_key": root.findtext("QueryKey"),
+    }
+
+def fetch_history_pmids(history: dict, limit: Optional[int] = None, client: Optional[EutilsClient] = None) -> list[str]:
+    """History サーバー上の検索結果の論文IDを EFetch (rettype=uilist) で UILIST_PAGE_SIZE 件ずつ取得する
+
+    Args:
+        history (dict): fetch_esearch_history の戻り値
+        limit (int, optional): 取得件数の上限. Defaults to None (全件).
+        client (EutilsClient, optional): 使用するクライアント. Defaults to 共有クライアント.
 
-    results = {}
-    cursor = start_date
+    Returns:
+        list[str]: 論文IDのリスト
+    """
+    client = client or get_client()
+    total = history["count"] if limit is None else min(history["count"], limit)
+    pmids = []
+    while len(pmids) < total:
+        params = {
+            **_history_params(history, len(pmids), min(UILIST_PAGE_SIZE, total - len(pmids))),
+            'rettype': 'uilist',
+            'retmode': 'text',
+        }
+        page = client.get('efetch.fcgi', params=params).text.split()
+        if not page:
+            break
+        pmids.extend(page)
+    return pmids
 
-    while cursor < today:
-        week_start = cursor
+def _history_params(history: dict, retstart: int, retmax: int) -> dict:
+    """History サーバーを参照する EFetch 用のパラメータを組み立てる"""
+    return {
+        'db': 'pubmed',
+        'WebEnv': history["webenv"],
+        'query_key': history["query_key"],
+        'retstart': retstart,
+        'retmax': retmax,
+        'retmode': 'xml',
+    }
+
+def week_windows(weeks: int = 12) -> list[tuple[str, str]]:
+    """過去N週間を1週間単位で区切った検索期間のリストを返す
+
+    週は月曜始まりに揃えるため、同じ週は日をまたいでも同じ期間になる（件数キャッシュのキーとして使う）。
+    最後の週は今週の月曜日から今日までの未確定の期間となる。
+
+    Args:
+        weeks (int): 遡る週数（デフォルト12週間）
+
+    Returns:
+        list[tuple[str, str]]: 古い順の (週の開始日, 週の終了日) 'YYYY/MM/DD' 形式
+    """
+    today = datetime.today().date()
+    this_monday = today - timedelta(days=today.weekday())
+    cursor = this_monday - timedelta(weeks=weeks - 1)
+
+    windows = []
+    while cursor <= today:
         week_end = cursor + timedelta(days=6)
 
         # 未来を超えないよう調整
         if week_end > today:
             week_end = today
 
-        # 文字列へ
-        min_date = week_start.strftime('%Y/%m/%d')
-        max_date = week_end.strftime('%Y/%m/%d')
-
-        # PubMed ESearch API
-        search_url = 'https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi'
-        query = ' AND '.join(keywords)
-
-        search_params = {
-            'db': 'pubmed',
-            'term': query,
-            'mindate': min_date,
-            'maxdate': max_date,
-            'retmode': 'xml',
-            'retmax': 1  # 件数確認だけなので1件で十分
-        }
+        windows.append((cursor.strftime('%Y/%m/%d'), week_end.strftime('%Y/%m/%d')))
 
-        response = requests.get(search_url, params=search_params)
+        # 次の週へ
+        cursor += timedelta(days=7)
 
-        # `<Count>123</Count>` を抽出
-        m = re.search(r'<Count>(\d+)</Count>', response.text)
-        count = int(m.group(1)) if m else 0
+    return windows
 
-        # 週の開始日をキーに保存
-        results[min_date] = count
+def fetch_hit_count(keywords: list[str], min_date: str, max_date: str, client: Optional[EutilsClient] = None) -> int:
+    """指定期間の PubMed ヒット件数を返す
 
-        # 次の週へ
-        cursor += timedelta(days=7)
+    Args:
+        keywords (list[str]): 検索キーワードのリスト
+        min_date (str): 検索開始日 (YYYY/MM/DD)
+        max_date (str): 検索終了日 (YYYY/MM/DD)
+        client (EutilsClient, optional): 使用するクライアント. Defaults to 共有クライアント.
+
+    Returns:
+        int: ヒット件数
+    """
+    client = client or get_client()
+    search_params = {
+        'db': 'pubmed',
+        'term': ' AND '.join(keywords),
+        'mindate': min_date,
+        'maxdate': max_date,
+        'retmode': 'xml',
+        'retmax': 1  # 件数確認だけなので1件で十分
+    }
+    response = client.get('esearch.fcgi', params=search_params)
 
+    # `<Count>123</Count>` を抽出
+    m = re.search(r'<Count>(\d+)</Count>', response.text)
+    return int(m.group(1)) if m else 0
+
+def fetch_weekly_counts(keywords: list[str], weeks: int = 12, client: Optional[EutilsClient] = None,
+                        max_workers: int = 4, use_cache: bool = True):
+    """
+    過去N週間分を1週間単位で区切って PubMed のヒット件数を返す。
+    
+    Args:
+        keywords (list[str]): 検索キーワードのリスト
+        weeks (int): 遡る週数（デフォルト12週間）
+        client (EutilsClient, optional): 使用するクライアント. Defaults to 共有クライアント.
+        max_workers (int, optional): 同時に発行するリクエスト数の上限. Defaults to 4.
+        use_cache (bool, optional): 確定済みの週を件数キャッシュから返すか. Defaults to True.
+    
+    Returns:
+        dict: { "YYYY/MM/DD": int } 各週の開始日のヒット件数
+    """
+    return fetch_weekly_counts_multi(
+        [keywords], weeks, client=client, max_workers=max_workers, use_cache=use_cache
+    )[0]
+
+def fetch_weekly_counts_multi(keyword_sets: list[list[str]], weeks: int = 12,
+                              client: Optional[EutilsClient] = None, max_workers: int = 4,
+                              use_cache: bool = True) -> list[dict]:
+    """複数のキーワードセットについて、週ごとのヒット件数をまとめて取得する
+
+    確定済みの週は件数キャッシュから返し、残り（今週分と期限切れのエントリ）の ESearch を
+    ひとつのスレッドプールで並行に発行する。送信ペースは EutilsClient のレートリミッターで
+    NCBI の上限内に抑えられる。
+
+    Args:
+        keyword_sets (list[list[str]]): キーワードリストのリスト（1要素が1系列）
+        weeks (int): 遡る週数（デフォルト12週間）
+        client (EutilsClient, optional): 使用するクライアント. Defaults to 共有クライアント.
+        max_workers (int, optional): 同時に発行するリクエスト数の上限. Defaults to 4.
+        use_cache (bool, optional): 確定済みの週を件数キャッシュから返すか. Defaults to True.
+
+    Returns:
+        list[dict]: keyword_sets と同じ順の { "YYYY/MM/DD": int }（各辞書は週の古い順）
+    """
+    client = client or get_client()
+    cache = get_count_cache() if use_cache else None
+    windows = week_windows(weeks)
+
+    results = [{} for _ in keyword_sets]
+    pending = []
+    for i, keywords in enumerate(keyword_sets):
+        for min_date, max_date in windows:
+            cached = cache.get(keywords, min_date, max_date) if cache else None
+            results[i][min_date] = cached
+            if cached is None:
+                pending.append((i, keywords, min_date, max_date))
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(fetch_hit_count, keywords, min_date, max_date, client)
+                for _, keywords, min_date, max_date in pending
+            ]
+            for (i, keywords, min_date, max_date), future in zip(pending, futures):
+                count = future.result()
+                results[i][min_date] = count
+                if cache:
+                    cache.put(keywords, min_date, max_date, count)
+
+        if cache:
+            cache.save()
+
+    print(f"(fetch_weekly_counts) {len(keyword_sets) * len(windows)} 週分のうち {len(pending)} 週分を PubMed から取得しました。")
     return results
 
 # メイン処理 (ユーザー入力のキーワードで検索)
@@ -265,23 +617,16 @@ if __name__ == '__main__':
 
     print(f'{len(pmids)} 件の論文を取得しました。')
 
-    # 論文情報を取得
-    esummary_xml = fetch_esummary(pmids)
-    esummary_dict = parse_esummary_xml(esummary_xml)
-
-    # アブストラクトを取得
-    abstracts_dict = fetch_eFetch(pmids)
+    # 論文情報とアブストラクトを EFetch 1回で取得
+    papers = fetch_papers(pmids)
 
     # -------------------------
     # 🔸 論文情報を表示
     # -------------------------
-    for i, paper in enumerate(esummary_dict, start=1):
-        pmid = paper['pmid']
-        abstract = abstracts_dict.get(pmid, "N/A")
-
+    for i, paper in enumerate(papers, start=1):
         print(f"\n=== 論文 {i} ===")
-        print(f"PMID: {pmid}")
-        print(f"タイトル: {paper['Title']}")
+        print(f"PMID: {paper['pmid']}")
+        print(f"タイトル: {paper['title']}")
         print(f"出版日: {paper['pubdate']}")
-        print(f"URL: {paper['URL']}")
-        print(f"アブストラクト: {abstract}")
\ No newline at end of file
+        print(f"URL: {paper['url']}")
+        print(f"アブストラクト: {paper['abstract']}")
\ No newline at end of file
@@ -0,0 +1,164 @@
+# rate_limiter.py
+import time
+import threading
+from collections import deque
+
+
+class TokenBucket:
+    """スレッドセーフなトークンバケット方式のレートリミッター
+
+    rate 個/秒 でトークンが補充され、acquire() はトークンが揃うまで呼び出し元をブロックする。
+    待機時間は統計として記録され、stats() で参照できる。
+
+    Attributes:
+        rate (float): 1秒あたりのトークン補充数
+        capacity (float): バケットに貯められるトークンの最大数 (バースト許容量)
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rate は正の値を指定してください。")
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        self._acquired = 0
+        self._waited = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """トークンを消費する。不足している場合は補充されるまで待機する
+
+        Args:
+            tokens (float, optional): 消費するトークン数. Defaults to 1.0.
+
+        Returns:
+            float: 待機した秒数
+        """
+        tokens = min(tokens, self.capacity)
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            # 予約方式: 先にトークンを差し引き、不足分を待ち時間として確定させる
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+            self._acquired += 1
+            if wait > 0:
+                self._waited += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def stats(self) -> dict:
+        """待機時間の統計を返す
+
+        Returns:
+            dict: {"acquired": 取得回数, "waited": 待機が発生した回数,
+                   "total_wait": 合計待機秒, "max_wait": 最大待機秒}
+        """
+        with self._lock:
+            return {
+                "acquired": self._acquired,
+                "waited": self._waited,
+                "total_wait": round(self._total_wait, 3),
+                "max_wait": round(self._max_wait, 3),
+            }
+
+    def reset_stats(self) -> None:
+        """統計をリセットする"""
+        with self._lock:
+            self._acquired = 0
+            self._waited = 0
+            self._total_wait = 0.0
+            self._max_wait = 0.0
+
+
+class SlidingWindowLimiter:
+    """スレッドセーフなスライディングウィンドウ方式のレートリミッター (分あたりのクォータ用)
+
+    直近 window 秒の送信が max_requests 件・max_tokens トークンを超えないよう、acquire() で待機する。
+    トークンバケットと違いバースト後の補充が無いため、どの window 秒間を取っても上限を超えない。
+    リクエスト数とトークン数は同じ送信時刻で予約するため、片方の待機中にもう片方の枠がずれることはない。
+
+    Attributes:
+        max_requests (float | None): window 秒あたりのリクエスト数の上限 (None で無制限)
+        max_tokens (float | None): window 秒あたりのトークン数の上限 (None で無制限)
+        window (float): ウィンドウの長さ (秒)
+    """
+
+    def __init__(self, max_requests: float = None, max_tokens: float = None, window: float = 60.0):
+        if (max_requests is not None and max_requests < 1) or (max_tokens is not None and max_tokens <= 0):
+            raise ValueError("上限は正の値を指定してください。")
+        self.max_requests = max_requests
+        self.max_tokens = max_tokens
+        self.window = window
+
+        self._sent = deque()  # (送信時刻, トークン数) を予約した順に保持する
+        self._used_tokens = 0.0
+        self._lock = threading.Lock()
+
+        self._acquired = 0
+        self._waited = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def acquire(self, tokens: float = 0.0) -> float:
+        """1リクエスト分 (tokens トークン) の枠を予約する。枠が空くまで待機する
+
+        Args:
+            tokens (float, optional): リクエストのトークン数 (max_tokens を上限に丸める). Defaults to 0.0.
+
+        Returns:
+            float: 待機した秒数
+        """
+        if self.max_tokens is not None:
+            tokens = min(tokens, self.max_tokens)
+
+        with self._lock:
+            now = time.monotonic()
+            # 予約方式: 予約時刻は単調増加にし、それより window 秒以上前の送信はウィンドウから外す
+            start = max(now, self._sent[-1][0]) if self._sent else now
+            while self._sent and (self._over_limit(tokens) or self._sent[0][0] <= start - self.window):
+                sent_at, sent_tokens = self._sent.popleft()
+                self._used_tokens -= sent_tokens
+                start = max(start, sent_at + self.window)
+            self._sent.append((start, tokens))
+            self._used_tokens += tokens
+            wait = start - now
+
+            self._acquired += 1
+            if wait > 0:
+                self._waited += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def stats(self) -> dict:
+        """待機時間の統計を返す (TokenBucket.stats() と同じ形式)"""
+        with self._lock:
+            return {
+                "acquired": self._acquired,
+                "waited": self._waited,
+                "total_wait": round(self._total_wait, 3),
+                "max_wait": round(self._max_wait, 3),
+            }
+
+    def _over_limit(self, tokens: float) -> bool:
+        """今の予約に tokens トークンのリクエストを加えると上限を超えるか (ロック取得済みで呼ぶ)"""
+        if self.max_requests is not None and len(self._sent) + 1 > self.max_requests:
+            return True
+        return self.max_tokens is not None and self._used_tokens + tokens > self.max_tokens
@@ -0,0 +1,142 @@
+# result_archive.py
+import re
+import gzip
+import json
+from pathlib import Path
+from typing import Iterator
+
+# 結果ファイルの拡張子 (圧縮 JSON Lines / 従来の JSON)
+ARCHIVE_SUFFIX = ".jsonl.gz"
+LEGACY_SUFFIX = ".json"
+ARCHIVE_FORMAT_VERSION = 1
+
+# 結果ファイルのファイル名 (YYYY-MM-DD-YYYY-MM-DD.jsonl.gz または .json)
+ARCHIVE_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2})-(\d{4}-\d{2}-\d{2})(\.jsonl\.gz|\.json)$")
+
+# gzip の圧縮レベル (9 にしても小さくならず書き込みが遅くなるだけのため 6)
+COMPRESS_LEVEL = 6
+
+"""
+# 圧縮形式 (.jsonl.gz) のレコード
+
+{"type": "archive", "version": 1}                               先頭行
+{"type": "paper", "paper": {...}}                               論文エントリ (PMIDごとに1回だけ)
+{"type": "search", "search": {...}, "papers": ["pmid", ...]}    検索ブロック (論文は PMID で参照)
+
+同じ PMID でも内容の異なる論文エントリは、検索ブロックの papers に論文エントリをそのまま入れる。
+"papers" を持たない検索ブロック (エラーのブロック) は "papers": null とする。
+"""
+
+
+def is_archive_path(path: Path) -> bool:
+    """結果ファイル (新旧どちらかの形式) のファイル名か"""
+    return ARCHIVE_PATTERN.search(Path(path).name) is not None
+
+
+def archive_period(path: Path) -> str:
+    """結果ファイル名の検索期間 (YYYY-MM-DD-YYYY-MM-DD)"""
+    match = ARCHIVE_PATTERN.search(Path(path).name)
+    if not match:
+        raise ValueError(f"結果ファイルの名前ではありません: {path}")
+    return f"{match.group(1)}-{match.group(2)}"
+
+
+def iter_archive_paths(results_dir: Path, unique: bool = True) -> Iterator[Path]:
+    """ディレクトリ内の結果ファイル (新旧どちらかの形式) を列挙する
+
+    convert_archives --keep-legacy の後は同じ検索期間のファイルが両方の形式で残るため、
+    unique=True (デフォルト) なら検索期間ごとに1つ (圧縮形式を優先) だけを返す。
+    unique=False ならすべてのファイルを返す (削除・変換などファイル単位で扱う場合)。
+    """
+    results_dir = Path(results_dir)
+    if not results_dir.exists():
+        return
+    paths = [path for path in sorted(results_dir.iterdir()) if path.is_file() and is_archive_path(path)]
+    if not unique:
+        yield from paths
+        return
+
+    by_period = {}
+    for path in paths:
+        period = archive_period(path)
+        if period not in by_period or path.name.endswith(ARCHIVE_SUFFIX):
+            by_period[period] = path
+    yield from sorted(by_period.values())
+
+
+def archive_path(results_dir: Path, search_period: str) -> Path:
+    """検索期間の結果ファイル (圧縮形式) のパス"""
+    return Path(results_dir) / f"{search_period}{ARCHIVE_SUFFIX}"
+
+
+def read_archive(path: Path) -> list[dict]:
+    """結果ファイルを読み込み、manual_search の戻り値と同じ形式 (検索ブロックのリスト) で返す
+
+    拡張子が .jsonl.gz なら圧縮形式、それ以外は従来の JSON として読み込む。
+    """
+    path = Path(path)
+    if not path.name.endswith(ARCHIVE_SUFFIX):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    papers = {}
+    results = []
+    # 行ごとにストリームで読むより、まとめて展開してから分割する方が速い
+    for line in gzip.decompress(path.read_bytes()).decode("utf-8").splitlines():
+        record = json.loads(line)
+        kind = record.get("type")
+        if kind == "paper":
+            papers[record["paper"]["pmid"]] = record["paper"]
+        elif kind == "search":
+            block = dict(record["search"])
+            if record["papers"] is not None:
+                block["papers"] = [papers[ref] if isinstance(ref, str) else ref for ref in record["papers"]]
+            results.append(block)
+        elif kind == "archive" and record.get("version", 0) > ARCHIVE_FORMAT_VERSION:
+            raise ValueError(f"未対応の結果ファイルの形式です (version {record['version']}): {path}")
+    return results
+
+
+def write_archive(path: Path, results: list[dict]) -> None:
+    """検索結果を結果ファイルに書き込む
+
+    拡張子が .jsonl.gz なら論文を PMID で重複排除した圧縮形式、.json なら従来の JSON で書き込む。
+    書きかけのファイルを残さないよう、一時ファイルに書いてから置き換える。
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    if not path.name.endswith(ARCHIVE_SUFFIX):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        tmp_path.replace(path)
+        return
+
+    with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=COMPRESS_LEVEL) as f:
+        for record in _archive_records(results):
+            f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+    tmp_path.replace(path)
+
+
+def _archive_records(results: list[dict]) -> Iterator[dict]:
+    """圧縮形式のレコードを書き込み順に返す (論文レコードを参照する検索ブロックより先に出す)"""
+    papers = {}
+    searches = []
+    for block in results:
+        search = {key: value for key, value in block.items() if key != "papers"}
+        refs = None
+        if "papers" in block:
+            refs = []
+            for paper in block["papers"]:
+                pmid = paper.get("pmid")
+                if not isinstance(pmid, str):
+                    refs.append(paper)
+                elif papers.setdefault(pmid, paper) == paper:
+                    refs.append(pmid)
+                else:
+                    refs.append(paper)
+        searches.append({"type": "search", "search": search, "papers": refs})
+
+    yield {"type": "archive", "version": ARCHIVE_FORMAT_VERSION}
+    for paper in papers.values():
+        yield {"type": "paper", "paper": paper}
+    yield from searches
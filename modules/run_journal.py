@@ -0,0 +1,123 @@
+# run_journal.py
+import os
+import json
+import threading
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_JOURNAL_PATH = ROOT / "cache" / "weekly_search_journal.jsonl"
+
+
+class RunJournal:
+    """定期検索1回分の進捗を記録する追記専用のチェックポイントジャーナル (JSON Lines)
+
+    1行1レコードで、以下を追記する:
+        {"type": "run", "mindate", "maxdate"}             実行の開始 (先頭行)
+        {"type": "search", "title", "keywords", "pmids"}  ESearch 済みの検索ブロック
+        {"type": "paper", "paper"}                        要約まで完了した論文 (結果JSONの論文エントリ)
+        {"type": "complete"}                              結果JSONの保存まで完了
+
+    同じ論文が複数回記録された場合は後の行を優先する。中断時に書きかけだった末尾の行は読み飛ばす。
+    要約がエラー (コスト上限・Gemini の不調) の論文は再開時に取得・要約し直す。
+    ESearch の記録は取得ステージのスレッドから、論文の記録は要約ステージから行われるため、追記はロックで直列化する。
+
+    Attributes:
+        path (Path): ジャーナルファイルのパス
+        mindate (str): 検索開始日
+        maxdate (str): 検索終了日
+        complete (bool): 実行が完了しているか
+    """
+
+    def __init__(self, path: Path = DEFAULT_JOURNAL_PATH):
+        self.path = Path(path)
+        self.mindate = None
+        self.maxdate = None
+        self.complete = False
+        self._searches = {}
+        self._papers = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def start(cls, mindate: str, maxdate: str, path: Path = DEFAULT_JOURNAL_PATH) -> "RunJournal":
+        """新しい実行のジャーナルを作成する（既存のジャーナルは破棄する）"""
+        journal = cls(path)
+        journal.path.parent.mkdir(parents=True, exist_ok=True)
+        journal.path.write_text("", encoding="utf-8")
+        journal._append([{"type": "run", "mindate": mindate, "maxdate": maxdate}])
+        return journal
+
+    @classmethod
+    def resume(cls, path: Path = DEFAULT_JOURNAL_PATH) -> Optional["RunJournal"]:
+        """中断した実行のジャーナルを読み込む。存在しない・完了済みの場合は None"""
+        journal = cls(path)
+        if not journal.path.exists():
+            return None
+        journal._load()
+        if journal.mindate is None or journal.complete:
+            return None
+        return journal
+
+    def search_pmids(self, title: str, keywords: list[str]) -> Optional[list[str]]:
+        """ESearch 済みの検索ブロックの論文IDを返す。未記録なら None"""
+        return self._searches.get(self._search_key(title, keywords))
+
+    def record_search(self, title: str, keywords: list[str], pmids: list[str]) -> None:
+        """検索ブロックの ESearch 結果を記録する"""
+        self._append([{"type": "search", "title": title, "keywords": keywords, "pmids": pmids}])
+
+    def is_done(self, pmid: str) -> bool:
+        """論文の要約が完了しているか（エラーの要約は未完了とみなす）"""
+        paper = self._papers.get(pmid)
+        if paper is None:
+            return False
+        summary = paper.get("summary")
+        return not (isinstance(summary, dict) and summary.get("error"))
+
+    def record_papers(self, papers: list[dict]) -> None:
+        """要約済みの論文エントリを記録する"""
+        self._append([{"type": "paper", "paper": paper} for paper in papers])
+
+    def papers(self) -> dict[str, dict]:
+        """記録済みの論文エントリ {pmid: 論文エントリ}"""
+        with self._lock:
+            return dict(self._papers)
+
+    def mark_complete(self) -> None:
+        """実行の完了を記録する"""
+        self._append([{"type": "complete"}])
+
+    def _append(self, records: list[dict]) -> None:
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            for record in records:
+                self._apply(record)
+
+    def _apply(self, record: dict) -> None:
+        kind = record.get("type")
+        if kind == "run":
+            self.mindate, self.maxdate = record["mindate"], record["maxdate"]
+        elif kind == "search":
+            self._searches[self._search_key(record["title"], record["keywords"])] = record["pmids"]
+        elif kind == "paper":
+            self._papers[record["paper"]["pmid"]] = record["paper"]
+        elif kind == "complete":
+            self.complete = True
+
+    def _load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"(RunJournal) 読み込めない行を読み飛ばします: {line[:80]!r}")
+                    continue
+                self._apply(record)
+
+    @staticmethod
+    def _search_key(title: str, keywords: list[str]) -> str:
+        return json.dumps([title, keywords], ensure_ascii=False)
@@ -2,69 +2,42 @@ import sys
 from pathlib import Path
 import os
 import json
+import time
 from datetime import date
-from typing import List
 
 # Import modules
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT))
 import modules.gemini_operator as go
 import modules.pubmed_operator as po
+import modules.bd_operator as bo
+from modules.eutils_client import EutilsClient, get_client
+from modules.pipeline import DEFAULT_PREFETCH_DEPTH, prefetch
+from modules.run_journal import RunJournal
+from modules.result_archive import archive_path, read_archive, write_archive
 
-def search_papers(keywords: List[str], mindate: str = None, maxdate: str = None, max_results: int = 10) -> tuple[dict, dict]:
-    """PubMedから論文情報とアブストラクトを取得
-    Args:
-        keywords (List[str]): 検索キーワードのリスト
-        mindate (str, optional): 検索開始日 (YYYY/MM/DD). Defaults to None.
-        maxdate (str, optional): 検索終了日 (YYYY/MM/DD). Defaults to None.
-        max_results (int, optional): 最大取得論文数. Defaults to 10.
-    Returns:
-        tuple: esummary_list (dict), abstracts_dict (dict), mindate (str), maxdate (str)
-    """
-    print("(search_parpers) 論文開始...")
-    mindate, maxdate = po.calculate_date_range(mindate, maxdate)
-
-    # 論文IDを検索
-    pmids = po.fetch_esearch(keywords, mindate, maxdate)
-    if not pmids:
-        print("(search_parpers) 該当する論文はありませんでした。")
-        return {}, {}, mindate, maxdate
-    
-    if len(pmids) > max_results:
-        print(f"(search_parpers) 論文数が指定上限({max_results})より多いため検索を終了します。")
-        return {}, {}, mindate, maxdate
-    
-    print(f"(search_parpers) {len(pmids)} 件の論文がヒットしました。データ収集を開始します。")
-
-    # 論文情報を取得
-    esummary_xml = po.fetch_esummary(pmids)
-    esummary_list = po.parse_esummary_xml(esummary_xml)
-    print(f"(search_parpers) {len(pmids)} 件の論文を取得しました。")
+# 結果JSONに保存する論文レコードの項目 (abstract_sections は abstract に結合済みのため保存せず、要約の入力の絞り込みにだけ使う)
+OUTPUT_PAPER_FIELDS = ("pmid", "title", "pubdate", "url", "abstract")
 
-    # アブストラクトを取得
-    abstracts_dict = po.fetch_eFetch(pmids)
-    print(f"(search_parpers) アブストラクトを取得しました。")
+# 1ページ (EFetch 1リクエスト) あたりの取得件数
+DEFAULT_PAGE_SIZE = 100
+# 1回の実行で Gemini に送る要約リクエスト数の上限
+DEFAULT_MAX_LLM_CALLS = 100
 
-    return esummary_list, abstracts_dict, mindate, maxdate
-
-
-def summarize_abstracts(abstracts_dict: dict) -> dict[str, str]:
+def summarize_abstracts(abstracts_dict: dict, budget: go.SummaryBudget = None, gemini_client=None,
+                        engine: go.SummaryEngine = None) -> dict[str, str]:
     """
-    Gemini を使ってアブストラクトを要約
+    Gemini を使ってアブストラクトを並行に要約
+
+    budget が指定された場合、上限に達した以降の論文は要約せず、エラー扱いの要約を返す。
+    engine を渡すと、その並行数・分あたり上限・budget を使う（実行全体で共有する場合）。
     """
     print(f"(summarize_abstracts) Geminiによる要約を開始します...")
-    gemini_client = go.genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
-
-    summaries = {}
-    for pmid, abstract in abstracts_dict.items():
+    if engine is None:
+        gemini_client = gemini_client or go.genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+        engine = go.SummaryEngine(gemini_client, budget=budget)
 
-        if not abstract or abstract == "N/A" or not abstract.strip():
-            summaries[pmid] = "No abstract exists."
-            continue
-
-        prompt = go.build_prompt(go.PROMPT_TEMPLATE, abstract=abstract)
-        summary = go.request_gemini_json(gemini_client, prompt)
-        summaries[pmid] = summary
+    summaries = engine.summarize(abstracts_dict)
     print(f"(summarize_abstracts) 要約が完了しました。")
 
     return summaries
@@ -84,35 +57,161 @@ def save_config(new_date: str):
     with open(config_path, "w") as f:
         json.dump({"last_search_date": new_date}, f, indent=2, ensure_ascii=False)
 
-def manual_search(input_json: list, mindate: str, maxdate: str):
+class SearchPlan:
+    """実行全体の取得計画 (検索ブロックごとの論文IDと、全検索の和集合)
+
+    iter_pages() は検索ブロックを1つずつ ESearch し、まだ取得していない論文を page_size 件ずつ
+    EFetch で取得する。ESearch は次のページが必要になった時点で行うため、prefetch のスレッドで回すと
+    前の検索の論文の要約中に後続の検索の ESearch と取得が進む。
+    複数の検索ブロックにヒットした論文も取得・要約は1回で済ませる（初出の検索で取得する）。
+
+    Attributes:
+        searches (list): (search_title, keywords) のリスト
+        pmids_by_search (dict): 検索の番号 -> 論文IDのリスト (iter_pages() の進行に合わせて埋まる)
+        unique_pmids (dict): 重複を除いた論文ID (初出順、値は未使用)
+        skipped (int): ジャーナルに記録済みのため取得・要約を省略した論文数
+    """
+
+    def __init__(self, searches: list, mindate: str, maxdate: str, client: EutilsClient = None,
+                 journal: RunJournal = None):
+        self.searches = searches
+        self.mindate = mindate
+        self.maxdate = maxdate
+        self.client = client or get_client()
+        self.journal = journal
+        self.pmids_by_search = {}
+        self.unique_pmids = {}
+        self.skipped = 0
+
+    def iter_pages(self, page_size: int = DEFAULT_PAGE_SIZE):
+        """検索ブロックの順に、未取得の論文を page_size 件ずつ取得するジェネレータ
+
+        Yields:
+            list[dict]: 論文レコード 1ページ分
+        """
+        pending = []
+        fetched = 0
+        for index, (search_title, keywords) in enumerate(self.searches):
+            if not keywords:
+                continue
+            pmids = self._search_pmids(search_title, keywords)
+            self.pmids_by_search[index] = pmids
+
+            new_pmids = [pmid for pmid in dict.fromkeys(pmids) if pmid not in self.unique_pmids]
+            self.unique_pmids.update(dict.fromkeys(new_pmids))
+            for pmid in new_pmids:
+                if self.journal and self.journal.is_done(pmid):
+                    self.skipped += 1
+                else:
+                    pending.append(pmid)
+
+            while len(pending) >= page_size:
+                page, pending = pending[:page_size], pending[page_size:]
+                fetched += len(page)
+                yield self._fetch_page(page, fetched)
+
+        if pending:
+            fetched += len(pending)
+            yield self._fetch_page(pending, fetched)
+
+        total = sum(len(pmids) for pmids in self.pmids_by_search.values())
+        print(f"(SearchPlan) 延べ {total} 件のうち重複を除いた {len(self.unique_pmids)} 件が取得・要約の対象です。")
+        if self.skipped:
+            print(f"(SearchPlan) ジャーナルに記録済みの {self.skipped} 件の論文は取得・要約を省略しました。")
+
+    def _search_pmids(self, search_title: str, keywords: list[str]) -> list[str]:
+        """検索ブロックの論文IDを ESearch で取得する（ジャーナルに記録済みならそれを使い、新たな結果は記録する）"""
+        pmids = self.journal.search_pmids(search_title, keywords) if self.journal else None
+        if pmids is None:
+            pmids = po.fetch_esearch_all(keywords, self.mindate, self.maxdate, client=self.client)
+            if self.journal:
+                self.journal.record_search(search_title, keywords, pmids)
+        print(f"(SearchPlan) '{search_title}': {len(pmids)} 件の論文がヒットしました。")
+        return pmids
+
+    def _fetch_page(self, pmids: list[str], fetched: int) -> list[dict]:
+        page = po.fetch_papers(pmids, client=self.client)
+        print(f"(SearchPlan) {fetched}/{len(self.unique_pmids) - self.skipped} 件の論文を取得しました (ヒット済みの分)。")
+        return page
+
+
+def manual_search(input_json: list, mindate: str, maxdate: str, page_size: int = DEFAULT_PAGE_SIZE,
+                  budget: go.SummaryBudget = None, prefetch_depth: int = DEFAULT_PREFETCH_DEPTH,
+                  journal: RunJournal = None):
     """Flaskからマニュアルサーチする際のメイン処理
 
+    検索ブロックを1つずつ ESearch して論文をページ単位で取得し（SearchPlan）、取得したページから順に要約する。
+    複数の検索にヒットした論文も取得・要約は1回だけ行い、最後に結果を各検索ブロックに振り分ける。
+    ESearch と PubMed からの取得はバックグラウンドのスレッドで先読みし（最大 prefetch_depth ページ）、
+    前のページの要約中に後続の検索の ESearch と次のページの取得を進める。
+    要約コストは budget で実行全体に対して制限する。
+    journal を渡すと ESearch の結果と要約済みの論文をページごとに記録し、記録済みの作業は省略する
+    （中断した実行の再開）。この場合、結果はジャーナルの記録から組み立てる。
+
     Args;
         input_json (list): 検索メタデータのリスト
         mindate (str): 検索開始日
         maxdate (str): 検索終了日 
+        page_size (int, optional): 1ページあたりの取得件数. Defaults to DEFAULT_PAGE_SIZE.
+        budget (SummaryBudget, optional): 要約コストの上限. Defaults to DEFAULT_MAX_LLM_CALLS 件.
+        prefetch_depth (int, optional): 要約を待たずに先読みするページ数. Defaults to DEFAULT_PREFETCH_DEPTH.
+        journal (RunJournal, optional): チェックポイントジャーナル. Defaults to None (記録しない).
 
     Returns:
         results (list): 各検索結果のリスト
     """
     print(f"(manual_search) 文献調査を開始します: 検索期間: {mindate} ～ {maxdate}")
-    results = []
+    started = time.perf_counter()
+    # 待機の統計はプロセス全体の累計のため、開始時点との差分をこの実行の分として表示する
+    wait_before = get_client().wait_stats()
+    mindate, maxdate = po.calculate_date_range(mindate, maxdate)
+    budget = budget or go.SummaryBudget(max_calls=DEFAULT_MAX_LLM_CALLS)
+    engine = None
+
+    searches = []
     for meta in input_json:
         search_title = meta.get("search_title", "Untitled search")
         keywords = meta.get("keywords", [])
+        searches.append((search_title, keywords))
+
+    # 取得ステージ (先読みスレッドで ESearch・EFetch) と要約ステージ: 重複を除いた論文を1回ずつ取得・要約する
+    plan = SearchPlan(searches, mindate, maxdate, journal=journal)
+    papers_by_pmid = {}
+    for page in prefetch(plan.iter_pages(page_size=page_size), depth=prefetch_depth):
+        if engine is None:
+            gemini_client = go.genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+            engine = go.SummaryEngine(gemini_client, budget=budget)
+            cache_before = engine.cache_stats()
+        abstracts_dict = {paper["pmid"]: po.summary_abstract(paper) for paper in page}
+        summaries = summarize_abstracts(abstracts_dict, engine=engine)
+        output_papers = [to_output_paper(paper, summaries.get(paper["pmid"])) for paper in page]
+        if journal:
+            journal.record_papers(output_papers)
+        papers_by_pmid.update((paper["pmid"], paper) for paper in output_papers)
+
+    if journal:
+        papers_by_pmid = journal.papers()
+
+    # 各検索ブロックへの振り分け
+    papers_by_search = {
+        index: [papers_by_pmid[pmid] for pmid in pmids if pmid in papers_by_pmid]
+        for index, pmids in plan.pmids_by_search.items()
+    }
+    duplicates = sum(len(pmids) for pmids in plan.pmids_by_search.values()) - len(plan.unique_pmids)
+    if duplicates:
+        print(f"(manual_search) 検索間の重複により {duplicates} 件の論文取得・要約リクエストを省略しました。")
+
+    results = []
+    for index, (search_title, keywords) in enumerate(searches):
         if not keywords:
             results.append({"error": f"{search_title}: keywords がありません。"})
             continue
-        
-        # 論文検索
-        esummary_list, abstracts_dict, mindate, maxdate = search_papers(keywords, mindate, maxdate)
-        if not esummary_list:
+
+        papers = papers_by_search.get(index, [])
+        if not papers:
             results.append({"title": search_title, "papers": []})
             continue
 
-        # 要約生成
-        summaries = summarize_abstracts(abstracts_dict)
-
         # 出力データ構築
         print(f"(manual_search) 出力データを構築します...")
         search_period = f"{mindate}-{maxdate}".replace("/", "-")
@@ -120,26 +219,101 @@ def manual_search(input_json: list, mindate: str, maxdate: str):
             "title": search_title,
             "keywords": keywords,
             "search_period": search_period,
-            "paper_count": len(esummary_list),
-            "papers": []
+            "paper_count": len(papers),
+            "papers": papers
         }
-        for esummary in esummary_list:
-            pmid = esummary["pmid"]
-            output_data["papers"].append({
-                "pmid": pmid,
-                "title": esummary["Title"],
-                "pubdate": esummary["pubdate"],
-                "url": esummary["URL"],
-                "abstract": abstracts_dict.get(pmid),
-                "summary": summaries.get(pmid)
-            })
         results.append(output_data)
 
         print(f"(manual_search) '{search_title}' の処理が完了しました。")
+
+    print(f"(manual_search) 所要時間: {time.perf_counter() - started:.1f} 秒")
+    wait_after = get_client().wait_stats()
+    wait = {key: wait_after[key] - wait_before[key] for key in ("waited", "acquired", "total_wait")}
+    print(f"(manual_search) NCBIレート制限による待機: {wait['waited']}/{wait['acquired']} 件, 合計 {wait['total_wait']:.1f} 秒")
+    print(f"(manual_search) Gemini リクエスト: {budget.calls} 件, 推定トークン: {budget.tokens}")
+    if engine is not None:
+        print(f"(manual_search) Gemini レスポンスの解析失敗: {engine.parse_stats()['parse_failures']} 件")
+    if engine is not None and engine.cache_stats():
+        cache = engine.cache_stats()
+        print(f"(manual_search) 要約キャッシュ: ヒット {cache['hits'] - cache_before['hits']} 件, "
+              f"ミス {cache['misses'] - cache_before['misses']} 件")
+    if engine is not None and engine.deferred:
+        print(f"(manual_search) Gemini の不調により要約を後回しにした論文: {len(engine.deferred)} 件 (fill_deferred_summaries で再要約できます)")
     return results
 
-def run_weekly_search(input_path: str, mindate: str, maxdate: str):
+def is_deferred_summary(summary) -> bool:
+    """Gemini の不調で要約を後回しにした論文の summary かどうか"""
+    return isinstance(summary, dict) and bool(summary.get("deferred"))
+
+def fill_deferred_summaries(results: list, engine: go.SummaryEngine = None) -> int:
+    """後回しにした要約 (summary.deferred) を再要約して results を上書きする
+
+    Args:
+        results (list): manual_search の戻り値 (保存済み結果JSONの内容)
+        engine (SummaryEngine, optional): 要約に使うエンジン. 未指定の場合は新規に作成する.
+
+    Returns:
+        int: 要約できた論文数
+    """
+    targets = [
+        paper
+        for result in results
+        for paper in result.get("papers", [])
+        if is_deferred_summary(paper.get("summary"))
+    ]
+    if not targets:
+        print("(fill_deferred_summaries) 後回しにした要約はありません。")
+        return 0
+
+    print(f"(fill_deferred_summaries) 後回しにした要約 {len(targets)} 件を再要約します...")
+    if engine is None:
+        gemini_client = go.genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+        engine = go.SummaryEngine(gemini_client, budget=go.SummaryBudget(max_calls=DEFAULT_MAX_LLM_CALLS))
+    summaries = engine.summarize({paper["pmid"]: po.summary_abstract(paper) for paper in targets})
+
+    filled = 0
+    for paper in targets:
+        summary = summaries.get(paper["pmid"])
+        paper["summary"] = summary
+        if not is_deferred_summary(summary):
+            filled += 1
+    print(f"(fill_deferred_summaries) {filled}/{len(targets)} 件を要約しました。")
+    return filled
+
+def fill_deferred_file(result_path: str):
+    """保存済みの結果ファイル (圧縮形式・従来の JSON) の後回しにした要約を埋め、同じ形式で上書き保存する (CLIエントリーポイント)"""
+    result_path = Path(result_path)
+    if not result_path.exists():
+        print(f"[ERROR] 結果ファイルが存在しません: {result_path}")
+        return
+
+    results = read_archive(result_path)
+    if fill_deferred_summaries(results):
+        write_archive(result_path, results)
+        print(f"Result saved:{result_path}")
+
+        # DB に保存済みの要約も更新する
+        summaries = {
+            paper["pmid"]: paper["summary"]
+            for result in results
+            for paper in result.get("papers", [])
+            if not is_deferred_summary(paper.get("summary"))
+        }
+        with bo.create_db_app().app_context():
+            bo.update_summaries(summaries)
+
+def to_output_paper(paper: dict, summary) -> dict:
+    """論文レコードと要約を結果JSONの論文エントリにまとめる"""
+    output = {field: paper.get(field) for field in OUTPUT_PAPER_FIELDS}
+    output["summary"] = summary
+    return output
+
+def run_weekly_search(input_path: str, mindate: str, maxdate: str, page_size: int = DEFAULT_PAGE_SIZE,
+                      max_llm_calls: int = DEFAULT_MAX_LLM_CALLS, max_tokens: int = None, resume: bool = False):
     """CLIエントリーポイント
+
+    進捗はチェックポイントジャーナルに記録し、resume=True の場合は中断した実行の続きから再開する
+    （検索期間はジャーナルに記録された期間を引き継ぐ）。
     """
     # 引数取得
     input_path = Path(input_path)
@@ -149,6 +323,17 @@ def run_weekly_search(input_path: str, mindate: str, maxdate: str):
         print(f"[ERROR] 入力ファイルが存在しません: {input_path}")
         return
     
+    # 中断した実行の再開
+    journal = RunJournal.resume() if resume else None
+    if resume and journal is None:
+        print("(run_weekly_search) 再開できる実行がないため、新しく実行します。")
+    if journal and ((mindate and mindate != journal.mindate) or (maxdate and maxdate != journal.maxdate)):
+        print("(run_weekly_search) 指定された検索期間が中断した実行と異なるため、新しく実行します。")
+        journal = None
+    if journal:
+        mindate, maxdate = journal.mindate, journal.maxdate
+        print(f"(run_weekly_search) 中断した実行を再開します: {journal.path}")
+
     # 検索期間処理
     if mindate is None:
         config = load_config()
@@ -167,7 +352,9 @@ def run_weekly_search(input_path: str, mindate: str, maxdate: str):
         return
 
     #--- 検索と要約の実行 ---
-    results = manual_search(metas, mindate, maxdate)
+    budget = go.SummaryBudget(max_calls=max_llm_calls, max_tokens=max_tokens)
+    journal = journal or RunJournal.start(mindate, maxdate)
+    results = manual_search(metas, mindate, maxdate, page_size=page_size, budget=budget, journal=journal)
 
     if not results:
         print("検索結果がありませんでした。")
@@ -177,13 +364,17 @@ def run_weekly_search(input_path: str, mindate: str, maxdate: str):
     output_dir = Path("search_result")
     output_dir.mkdir(parents=True, exist_ok=True)
     search_period = f"{mindate}-{maxdate}".replace("/", "-")
-    output_path = output_dir / f"{search_period}.json"
+    output_path = archive_path(output_dir, search_period)
 
-    # --- JSON 保存 ---
-    with open(output_path, "w") as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    # --- 結果ファイル保存 (論文を PMID で重複排除した圧縮 JSON Lines) ---
+    write_archive(output_path, results)
     print(f"Result saved:{output_path}")
 
+    # --- DB 保存 ---
+    with bo.create_db_app().app_context():
+        bo.store_results(results, search_period=search_period)
+
     # --- config更新 ---
     save_config(new_date=maxdate) 
     print(f"\nUpdated last_search_date to {maxdate} in config.json")
+    journal.mark_complete()
@@ -0,0 +1,168 @@
+# summary_cache.py
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE_PATH = ROOT / "cache" / "summaries.jsonl"
+
+# キャッシュファイルの上限サイズ (超えた分は最終利用が古い順に破棄する)
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+# ファイルが有効なエントリの COMPACT_RATIO 倍 + COMPACT_MIN_BYTES を超えたら書き直す (古い行を取り除く)
+COMPACT_RATIO = 2.0
+COMPACT_MIN_BYTES = 1024 * 1024
+
+
+def summary_key(abstract: str, template: str, model: str) -> str:
+    """(アブストラクト, プロンプトテンプレート, モデル名) から内容アドレスのキーを作る"""
+    digest = hashlib.sha256()
+    for part in (model, template, abstract):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    """Gemini 要約結果の永続キャッシュ (追記型の JSON Lines ファイル)
+
+    同じアブストラクトを同じテンプレート・モデルで要約した結果を再利用する。
+    エントリの合計サイズが max_bytes を超えると、最終利用が古いものから破棄する。
+
+    save() は前回の save() 以降に登録したエントリと、利用したエントリの最終利用時刻だけを追記する
+    (1行1レコード、同じキーは後の行を優先)。
+    破棄・更新で不要になった行がファイルの大半を占めるようになったら、有効なエントリだけで書き直す。
+
+    Attributes:
+        path (Path): キャッシュファイルのパス
+        max_bytes (int): エントリの合計サイズの上限
+        hits (int): キャッシュヒット数
+        misses (int): キャッシュミス数
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, max_bytes: Optional[int] = None):
+        self.path = Path(path)
+        self.max_bytes = max_bytes or int(os.getenv("SUMMARY_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._dirty = set()
+        self._touched = set()
+        self._entries = self._load()
+        self._total_bytes = sum(entry["size"] for entry in self._entries.values())
+        self._evict()
+
+    def get(self, abstract: str, template: str, model: str):
+        """キャッシュ済みの要約を返す。無ければ None"""
+        key = summary_key(abstract, template, model)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry["last_used"] = time.time()
+            self._touched.add(key)
+            return entry["summary"]
+
+    def put(self, abstract: str, template: str, model: str, summary) -> None:
+        """要約を登録する。エラーの要約は登録しない。ファイルへの書き出しは save() で行う"""
+        if not isinstance(summary, dict) or summary.get("error"):
+            return
+
+        key = summary_key(abstract, template, model)
+        size = len(json.dumps(summary, ensure_ascii=False).encode("utf-8"))
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries[key]["size"]
+            self._entries[key] = {"summary": summary, "size": size, "last_used": time.time()}
+            self._total_bytes += size
+            self._dirty.add(key)
+            self._evict()
+
+    def save(self) -> None:
+        """前回の save() 以降に登録したエントリと、利用したエントリの最終利用時刻をファイルに追記する"""
+        with self._lock:
+            self._dirty &= self._entries.keys()
+            self._touched = (self._touched & self._entries.keys()) - self._dirty
+            if not self._dirty and not self._touched:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            file_bytes = self.path.stat().st_size if self.path.exists() else 0
+            if file_bytes > self._total_bytes * COMPACT_RATIO + COMPACT_MIN_BYTES:
+                self._compact()
+            else:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    for key in self._dirty:
+                        f.write(self._line(key))
+                    for key in self._touched:
+                        f.write(json.dumps({"key": key, "last_used": self._entries[key]["last_used"]}) + "\n")
+            self._dirty.clear()
+            self._touched.clear()
+
+    def stats(self) -> dict:
+        """ヒット/ミス数とキャッシュサイズを返す"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+            }
+
+    def _line(self, key: str) -> str:
+        return json.dumps({"key": key, **self._entries[key]}, ensure_ascii=False) + "\n"
+
+    def _compact(self) -> None:
+        """有効なエントリだけでファイルを書き直す (ロック取得済みで呼ぶ)"""
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for key in self._entries:
+                f.write(self._line(key))
+        tmp_path.replace(self.path)
+
+    def _evict(self) -> None:
+        """合計サイズが上限を下回るまで最終利用が古いエントリを破棄する (ロック取得済みで呼ぶ)"""
+        if self._total_bytes <= self.max_bytes:
+            return
+        for key in sorted(self._entries, key=lambda k: self._entries[k]["last_used"]):
+            self._total_bytes -= self._entries.pop(key)["size"]
+            if self._total_bytes <= self.max_bytes:
+                break
+
+    def _load(self) -> dict:
+        entries = {}
+        if not self.path.exists():
+            return entries
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    key = record.pop("key")
+                except (json.JSONDecodeError, KeyError, AttributeError):
+                    # 書き込み途中で中断した行などは読み飛ばす
+                    continue
+                if "summary" in record:
+                    entries[key] = record
+                elif key in entries:
+                    # 利用の記録 (最終利用時刻のみ)
+                    entries[key]["last_used"] = record["last_used"]
+        return entries
+
+
+_default_cache: Optional[SummaryCache] = None
+_default_lock = threading.Lock()
+
+
+def get_summary_cache() -> SummaryCache:
+    """プロセス共有の SummaryCache を返す（初回呼び出し時に生成）"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = SummaryCache()
+        return _default_cache
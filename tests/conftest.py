@@ -0,0 +1,30 @@
+# conftest.py
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+import modules.rate_limiter as rate_limiter
+
+
+class FakeClock:
+    """time.monotonic / time.sleep の代わりに使う仮想時計 (sleep で時刻を進める)"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """レートリミッターの時刻を仮想時計に差し替える"""
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    return clock
@@ -0,0 +1,58 @@
+# test_archive_catalog.py
+import sys
+import os
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from modules.archive_catalog import ArchiveCatalog
+from modules.result_archive import write_archive
+
+RESULTS = [
+    {
+        "title": "search a",
+        "keywords": ["k1"],
+        "search_period": "2025-01-01-2025-01-07",
+        "paper_count": 1,
+        "papers": [{"pmid": "1", "title": "t", "url": "u", "pubdate": "d", "abstract": "a", "summary": {}}],
+    },
+    {"error": "search b: keywords がありません。"},
+]
+
+
+def test_refresh_lists_one_entry_per_period(tmp_path):
+    results_dir = tmp_path / "search_result"
+    results_dir.mkdir()
+    write_archive(results_dir / "2025-01-01-2025-01-07.json", RESULTS)
+    write_archive(results_dir / "2025-01-01-2025-01-07.jsonl.gz", RESULTS)
+    write_archive(results_dir / "2025-01-08-2025-01-14.json", [])
+
+    catalog = ArchiveCatalog(results_dir, tmp_path / "catalog.json")
+    changed = catalog.refresh()
+
+    assert sorted(path.name for path in changed) == ["2025-01-01-2025-01-07.jsonl.gz", "2025-01-08-2025-01-14.json"]
+    entries = catalog.entries()
+    assert [entry["name"] for entry in entries] == ["2025-01-08-2025-01-14.json", "2025-01-01-2025-01-07.jsonl.gz"]
+    assert entries[1]["paper_count"] == 1
+    assert entries[1]["searches"] == [{"title": "search a", "paper_count": 1}]
+
+    # 変換前の名前 (.json) でも同じ検索期間のエントリを返す
+    assert catalog.get("2025-01-01-2025-01-07.json")["name"] == "2025-01-01-2025-01-07.jsonl.gz"
+    assert catalog.get("2025-02-01-2025-02-07.json") is None
+
+
+def test_refresh_rescans_only_changed_files(tmp_path):
+    results_dir = tmp_path / "search_result"
+    results_dir.mkdir()
+    write_archive(results_dir / "2025-01-01-2025-01-07.jsonl.gz", RESULTS)
+    ArchiveCatalog(results_dir, tmp_path / "catalog.json").refresh()
+
+    # 保存済みのカタログを読み込んだ直後は、ディレクトリが変わっていなければ走査しない
+    catalog = ArchiveCatalog(results_dir, tmp_path / "catalog.json")
+    assert catalog.refresh() == []
+
+    write_archive(results_dir / "2025-01-08-2025-01-14.jsonl.gz", RESULTS)
+    stat = results_dir.stat()
+    os.utime(results_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert [path.name for path in catalog.refresh()] == ["2025-01-08-2025-01-14.jsonl.gz"]
+    assert len(catalog.entries()) == 2
@@ -0,0 +1,86 @@
+# test_bd_operator.py
+import sys
+from pathlib import Path
+
+import pytest
+from flask import Flask
+from sqlalchemy import func, select
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+import modules.bd_operator as bo
+from extensions import db
+
+PERIOD = "2025-01-01-2025-01-07"
+
+
+def make_paper(pmid):
+    return {
+        "pmid": pmid,
+        "title": f"title {pmid}",
+        "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+        "pubdate": "2025 Jan 1",
+        "abstract": f"abstract {pmid}",
+        "summary": {"目的": "p", "サンプル": "s", "解析手法": "m", "結果": "r", "結論": "c"},
+    }
+
+
+def make_results(papers_a, papers_b):
+    return [
+        {"title": "search a", "keywords": ["k1"], "search_period": PERIOD, "paper_count": len(papers_a), "papers": papers_a},
+        {"title": "search b", "keywords": ["k1", "k2"], "search_period": PERIOD, "paper_count": len(papers_b), "papers": papers_b},
+        {"error": "search c: keywords がありません。"},
+    ]
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'test.db'}"
+    bo.init_db(app)
+    with app.app_context():
+        yield app
+
+
+def count(model):
+    return db.session.execute(select(func.count()).select_from(model)).scalar()
+
+
+def test_store_results_imports_searches_papers_and_hits(app):
+    data = make_results([make_paper("1"), make_paper("2")], [make_paper("2"), make_paper("3")])
+
+    assert bo.store_results(data, search_period=PERIOD)
+    assert count(bo.SearchResult) == 2
+    assert count(bo.Paper) == 3
+    assert count(bo.SearchHit) == 4
+
+    searches = bo.list_searches(PERIOD)
+    page = bo.load_search_papers(searches[1]["id"], page=1, per_page=1)
+    assert page["total"] == 2 and page["has_more"]
+    assert [paper["pmid"] for paper in page["papers"]] == ["2"]
+    assert bo.load_abstract("3") == "abstract 3"
+
+    # 同じ検索期間は保存済みとしてスキップする
+    assert not bo.store_results(data, search_period=PERIOD)
+    assert count(bo.SearchResult) == 2
+
+
+def test_import_failure_rolls_back_the_whole_file(app):
+    broken = make_results([make_paper("1"), make_paper("2")], [{"title": "pmid がない論文"}])
+
+    with pytest.raises(KeyError):
+        bo.import_json(broken, batch_size=1, search_period=PERIOD)
+
+    # 前のバッチの論文も検索結果も残さないため、同じ検索期間を取り込み直せる
+    assert count(bo.SearchResult) == 0
+    assert count(bo.Paper) == 0
+    assert count(bo.SearchHit) == 0
+
+    fixed = make_results([make_paper("1"), make_paper("2")], [make_paper("3")])
+    assert bo.store_results(fixed, search_period=PERIOD)
+    assert count(bo.SearchResult) == 2
+    assert count(bo.SearchHit) == 3
+
+
+def test_load_search_papers_returns_none_for_unknown_search(app):
+    assert bo.load_search_papers(12345) is None
@@ -0,0 +1,32 @@
+# test_count_cache.py
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from modules.count_cache import WeeklyCountCache, normalize_query
+
+
+def test_normalize_query_ignores_order_and_whitespace():
+    assert normalize_query(["  heart   failure ", "SGLT2"]) == normalize_query(["SGLT2", "heart failure"])
+
+
+def test_normalize_query_keeps_boolean_operators_apart():
+    # PubMed は大文字の演算子だけを演算子として扱うため、"a or b" は3語の AND 検索になる
+    assert normalize_query(["a OR b"]) != normalize_query(["a or b"])
+    assert normalize_query(["Heart"]) != normalize_query(["heart"])
+
+
+def test_normalize_query_keeps_order_with_operators():
+    # 演算子は左から順に評価されるため、"(a OR b) AND c" と "(c AND a) OR b" を同じキーにしない
+    assert normalize_query(["a OR b", "c"]) != normalize_query(["c", "a OR b"])
+
+
+def test_closed_week_is_cached(tmp_path):
+    cache = WeeklyCountCache(path=tmp_path / "weekly_counts.json")
+    cache.put(["a OR b"], "2020/01/01", "2020/01/07", 12)
+    cache.save()
+
+    reloaded = WeeklyCountCache(path=tmp_path / "weekly_counts.json")
+    assert reloaded.get(["a OR b"], "2020/01/01", "2020/01/07") == 12
+    assert reloaded.get(["a or b"], "2020/01/01", "2020/01/07") is None
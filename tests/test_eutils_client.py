@@ -0,0 +1,142 @@
+# test_eutils_client.py
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+import requests
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+import modules.eutils_client as eutils_client
+from modules.eutils_client import EutilsClient
+from modules.rate_limiter import TokenBucket
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """server.replies の先頭から (ステータス, ヘッダ) を返し、無ければ 200 を返す E-utilities のスタブ"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self._reply()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.server.bodies.append(self.rfile.read(length).decode())
+        self._reply()
+
+    def _reply(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.command, self.path))
+            server.peers.add(self.client_address)
+            status, headers = server.replies.pop(0) if server.replies else (200, {})
+        body = b"<eSearchResult><Count>0</Count></eSearchResult>" if status == 200 else b""
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.lock = threading.Lock()
+    server.replies = []
+    server.requests = []
+    server.bodies = []
+    server.peers = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """リトライ時の time.sleep を記録するだけにする"""
+    sleeps = []
+    monkeypatch.setattr(eutils_client.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def make_client(server, **kwargs):
+    host, port = server.server_address
+    kwargs.setdefault("limiter", TokenBucket(rate=1000.0, capacity=1000))
+    return EutilsClient(base_url=f"http://{host}:{port}/", api_key="key", tool="test", **kwargs)
+
+
+def test_retries_429_honoring_retry_after(server, sleeps):
+    server.replies = [(429, {"Retry-After": "7"}), (503, {})]
+    client = make_client(server, backoff=0.5)
+
+    response = client.get("esearch.fcgi", params={"term": "cancer"})
+
+    assert response.status_code == 200
+    assert len(server.requests) == 3
+    # 429 は Retry-After の秒数、5xx (Retry-After 無し) は backoff * 2**attempt 秒待つ
+    assert sleeps == [7.0, 1.0]
+    assert all("api_key=key" in path and "term=cancer" in path for _, path in server.requests)
+
+
+def test_raises_after_max_retries(server, sleeps):
+    server.replies = [(502, {})] * 3
+    client = make_client(server, max_retries=2, backoff=0.1)
+
+    with pytest.raises(requests.HTTPError):
+        client.get("efetch.fcgi")
+
+    assert len(server.requests) == 3
+    assert sleeps == pytest.approx([0.1, 0.2])
+
+
+def test_client_error_is_not_retried(server, sleeps):
+    server.replies = [(400, {})]
+    client = make_client(server)
+
+    with pytest.raises(requests.HTTPError):
+        client.get("esearch.fcgi")
+
+    assert len(server.requests) == 1
+    assert sleeps == []
+
+
+def test_post_sends_identity_in_body(server, sleeps):
+    client = make_client(server)
+
+    client.post("efetch.fcgi", data={"id": "1,2,3"})
+
+    assert server.requests[0][0] == "POST"
+    assert "api_key=key" in server.bodies[0] and "id=1%2C2%2C3" in server.bodies[0]
+
+
+def test_session_reuses_one_connection(server, sleeps):
+    server.replies = [(503, {"Retry-After": "0"})]
+    client = make_client(server)
+
+    for _ in range(5):
+        client.get("esearch.fcgi").close()
+
+    # リトライを含む6リクエストが keep-alive の同じコネクションで送られる
+    assert len(server.requests) == 6
+    assert len(server.peers) == 1
+
+
+def test_every_attempt_passes_the_limiter(server, sleeps, clock):
+    server.replies = [(429, {"Retry-After": "0"})] * 2
+    client = make_client(server, limiter=TokenBucket(rate=2.0, capacity=1))
+
+    client.get("esearch.fcgi")
+    client.get("esearch.fcgi")
+
+    stats = client.wait_stats()
+    assert stats["acquired"] == 4 and stats["waited"] == 3
+    assert clock.now == pytest.approx(1001.5)
@@ -0,0 +1,156 @@
+# test_gemini_operator.py
+import sys
+import json
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+import modules.gemini_operator as gemini_operator
+from modules.circuit_breaker import CircuitBreaker
+from modules.gemini_operator import SUMMARY_FIELDS, SummaryBudget, SummaryEngine
+from modules.summary_cache import SummaryCache
+
+SUMMARY = {field: field for field in SUMMARY_FIELDS}
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModels:
+    def __init__(self, client):
+        self.client = client
+
+    def generate_content(self, model, contents, config=None):
+        with self.client.lock:
+            self.client.calls.append(contents)
+            if self.client.clock is not None:
+                self.client.call_times.append(self.client.clock.now)
+            reply = self.client.replies.pop(0) if self.client.replies else json.dumps(SUMMARY, ensure_ascii=False)
+        if isinstance(reply, Exception):
+            raise reply
+        return FakeResponse(reply)
+
+
+class ServiceError(Exception):
+    """google.genai.errors.APIError と同じく code にステータスを持つエラー"""
+
+    def __init__(self, code):
+        super().__init__(f"{code} UNAVAILABLE")
+        self.code = code
+
+
+class FakeGeminiClient:
+    """genai.Client の代わりに、送られたプロンプトを記録して replies (無ければ5項目の要約) を返す"""
+
+    def __init__(self, replies=None, clock=None):
+        self.replies = list(replies or [])
+        self.clock = clock
+        self.calls = []
+        self.call_times = []
+        self.lock = threading.Lock()
+        self.models = FakeModels(self)
+
+
+def test_engine_stays_within_requests_per_minute(clock):
+    client = FakeGeminiClient(clock=clock)
+    engine = SummaryEngine(client, max_workers=1, rpm=3, use_cache=False)
+
+    summaries = engine.summarize({str(i): f"abstract {i}" for i in range(10)})
+
+    assert all(summary == SUMMARY for summary in summaries.values())
+    times = sorted(client.call_times)
+    assert len(times) == 10
+    for start in times:
+        assert sum(1 for t in times if start <= t < start + 60.0) <= 3
+    assert engine.wait_stats()["waited"] > 0
+
+
+def test_engine_stays_within_tokens_per_minute(clock):
+    client = FakeGeminiClient(clock=clock)
+    engine = SummaryEngine(client, max_workers=1, tpm=2000, use_cache=False)
+
+    engine.summarize({str(i): "word " * 300 for i in range(8)})
+
+    tokens = engine._quota.max_tokens
+    per_request = engine._quota._sent[-1][1]
+    for start in client.call_times:
+        in_window = sum(1 for t in client.call_times if start <= t < start + 60.0)
+        assert in_window * per_request <= tokens
+
+
+def test_engine_without_quota_does_not_wait(monkeypatch):
+    monkeypatch.delenv("GEMINI_RPM", raising=False)
+    monkeypatch.delenv("GEMINI_TPM", raising=False)
+    engine = SummaryEngine(FakeGeminiClient(), use_cache=False)
+    assert engine.wait_stats() is None
+
+
+def test_incomplete_summary_is_retried_and_not_cached(tmp_path):
+    partial = json.dumps({"目的": "p", "結果": "r"}, ensure_ascii=False)
+    cache = SummaryCache(path=tmp_path / "summaries.jsonl")
+    client = FakeGeminiClient(replies=[partial, partial])
+    engine = SummaryEngine(client, max_workers=1, cache=cache, parse_retries=1)
+
+    summary = engine.summarize({"1": "abstract"})["1"]
+
+    assert summary["error"] and "raw_response" in summary
+    assert len(client.calls) == 2
+    assert engine.parse_failures == 2
+    assert cache.stats()["entries"] == 0
+
+    # 次の実行ではキャッシュから部分的な要約を返さず、要約し直す
+    engine = SummaryEngine(client, max_workers=1, cache=SummaryCache(path=tmp_path / "summaries.jsonl"))
+    assert engine.summarize({"1": "abstract"})["1"] == SUMMARY
+    assert len(client.calls) == 3
+
+
+def test_budget_skips_papers_beyond_the_call_limit():
+    client = FakeGeminiClient()
+    budget = SummaryBudget(max_calls=3)
+    engine = SummaryEngine(client, max_workers=1, budget=budget, use_cache=False)
+
+    summaries = engine.summarize({str(i): f"abstract {i}" for i in range(5)})
+
+    assert len(client.calls) == 3 and budget.calls == 3
+    assert [summaries[str(i)] for i in range(3)] == [SUMMARY] * 3
+    for pmid in ["3", "4"]:
+        assert summaries[pmid]["error"] and not summaries[pmid].get("deferred")
+    assert engine.deferred == []
+
+
+def test_retryable_error_is_retried(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(gemini_operator.time, "sleep", sleeps.append)
+    client = FakeGeminiClient(replies=[ServiceError(503), ServiceError(429)])
+    engine = SummaryEngine(client, max_workers=1, max_retries=2, use_cache=False)
+
+    assert engine.summarize({"1": "abstract"})["1"] == SUMMARY
+    assert len(client.calls) == 3 and len(sleeps) == 2
+    assert engine.breaker.state == "closed"
+
+
+def test_open_breaker_defers_the_rest_without_calling():
+    client = FakeGeminiClient(replies=[ServiceError(503)] * 2)
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=600.0)
+    engine = SummaryEngine(client, max_workers=1, max_retries=0, breaker=breaker, use_cache=False)
+
+    summaries = engine.summarize({str(i): f"abstract {i}" for i in range(5)})
+
+    # 2回続けて失敗した時点でブレーカーが開き、残りは Gemini を呼ばずに後回しにする
+    assert len(client.calls) == 2
+    assert breaker.state == "open"
+    assert all(summary["error"] and summary["deferred"] for summary in summaries.values())
+    assert engine.deferred == [str(i) for i in range(5)]
+
+
+def test_deferred_summaries_are_not_cached(tmp_path):
+    cache = SummaryCache(path=tmp_path / "summaries.jsonl")
+    client = FakeGeminiClient(replies=[ServiceError(503)])
+    engine = SummaryEngine(client, max_workers=1, max_retries=0, cache=cache)
+
+    assert engine.summarize({"1": "abstract"})["1"]["deferred"]
+    engine = SummaryEngine(client, max_workers=1, cache=SummaryCache(path=tmp_path / "summaries.jsonl"))
+    assert engine.summarize({"1": "abstract"})["1"] == SUMMARY
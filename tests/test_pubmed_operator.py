@@ -0,0 +1,59 @@
+# test_pubmed_operator.py
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+import modules.pubmed_operator as po
+
+ARTICLE = b"""<?xml version="1.0"?>
+<PubmedArticleSet>
+<PubmedArticle>
+  <MedlineCitation>
+    <PMID>123</PMID>
+    <Article>
+      <Journal><JournalIssue><PubDate><Year>2025</Year><Month>Jan</Month><Day>5</Day></PubDate></JournalIssue></Journal>
+      <ArticleTitle>A <i>trial</i></ArticleTitle>
+      <Abstract>
+        <AbstractText Label="BACKGROUND" NlmCategory="BACKGROUND">Why it <sup>matters</sup>.</AbstractText>
+        <AbstractText Label="METHODS" NlmCategory="METHODS">We randomized: 100 patients.</AbstractText>
+        <AbstractText Label="TRIAL REGISTRATION" NlmCategory="UNASSIGNED">NCT0000001.</AbstractText>
+        <AbstractText Label="FUNDING" NlmCategory="UNASSIGNED">None.</AbstractText>
+      </Abstract>
+    </Article>
+  </MedlineCitation>
+</PubmedArticle>
+</PubmedArticleSet>
+"""
+
+
+def test_parse_pubmed_articles_keeps_inline_markup():
+    [paper] = po.parse_pubmed_articles(ARTICLE)
+
+    assert paper["pmid"] == "123"
+    assert paper["title"] == "A trial"
+    assert paper["pubdate"] == "2025 Jan 5"
+    assert [section["label"] for section in paper["abstract_sections"]] == [
+        "BACKGROUND", "METHODS", "TRIAL REGISTRATION", "FUNDING",
+    ]
+    assert paper["abstract"].splitlines()[0] == "BACKGROUND: Why it matters."
+
+
+def test_summary_abstract_skips_registration_and_funding():
+    [paper] = po.parse_pubmed_articles(ARTICLE)
+
+    assert po.summary_abstract(paper) == "BACKGROUND: Why it matters.\nMETHODS: We randomized: 100 patients."
+
+
+def test_summary_abstract_is_the_same_for_saved_entries():
+    # 結果JSONの論文エントリには abstract_sections を保存しないが、再要約でも同じ入力になる
+    [paper] = po.parse_pubmed_articles(ARTICLE)
+    saved = {key: paper[key] for key in ("pmid", "title", "pubdate", "url", "abstract")}
+
+    assert po.summary_abstract(saved) == po.summary_abstract(paper)
+
+
+def test_summary_abstract_without_sections():
+    assert po.summary_abstract({"abstract": "Plain abstract: no labels."}) == "Plain abstract: no labels."
+    assert po.summary_abstract({"abstract": "N/A", "abstract_sections": []}) == "N/A"
+    assert po.summary_abstract({"abstract": "FUNDING: only funding"}) == "FUNDING: only funding"
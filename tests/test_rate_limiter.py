@@ -0,0 +1,70 @@
+# test_rate_limiter.py
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from modules.rate_limiter import SlidingWindowLimiter, TokenBucket
+
+
+def max_in_window(events, window=60.0):
+    """(時刻, 量) の列について、長さ window の半開区間に入る量の最大値"""
+    events = sorted(events)
+    return max(sum(amount for t, amount in events if start <= t < start + window) for start, _ in events)
+
+
+def test_token_bucket_paces_after_burst(clock):
+    bucket = TokenBucket(rate=2.0, capacity=2)
+    times = []
+    for _ in range(6):
+        bucket.acquire()
+        times.append(clock.now)
+
+    assert times[:2] == [1000.0, 1000.0]
+    assert times[2:] == pytest.approx([1000.5, 1001.0, 1001.5, 1002.0])
+    stats = bucket.stats()
+    assert stats["acquired"] == 6 and stats["waited"] == 4
+    assert stats["total_wait"] == pytest.approx(2.0)
+
+
+def test_token_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_sliding_window_keeps_requests_within_quota(clock):
+    limiter = SlidingWindowLimiter(max_requests=5, window=60.0)
+    events = []
+    for _ in range(23):
+        limiter.acquire()
+        events.append((clock.now, 1))
+        clock.now += 7.0  # リクエストの処理時間
+
+    assert max_in_window(events) <= 5
+    assert limiter.stats()["waited"] > 0
+
+
+def test_sliding_window_keeps_tokens_within_quota(clock):
+    limiter = SlidingWindowLimiter(max_requests=100, max_tokens=1000, window=60.0)
+    events = []
+    for tokens in [400, 300, 200, 500, 100, 900, 50, 600, 300, 1500]:
+        limiter.acquire(tokens)
+        events.append((clock.now, min(tokens, 1000)))
+        clock.now += 1.0
+
+    assert max_in_window(events) <= 1000
+
+
+def test_sliding_window_has_no_double_burst(clock):
+    # トークンバケット (capacity=上限) では最初の1分に 上限 + 補充分 を送れてしまう
+    limiter = SlidingWindowLimiter(max_requests=10, window=60.0)
+    start = clock.now
+    sent_first_minute = 0
+    while True:
+        limiter.acquire()
+        if clock.now - start >= 60.0:
+            break
+        sent_first_minute += 1
+    assert sent_first_minute == 10
@@ -0,0 +1,98 @@
+# test_result_archive.py
+import sys
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from modules.result_archive import archive_path, iter_archive_paths, read_archive, write_archive
+
+
+def make_paper(pmid, title="title", summary="summary"):
+    return {
+        "pmid": pmid,
+        "title": title,
+        "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+        "pubdate": "2025 Jan 1",
+        "abstract": "abstract",
+        "summary": {"目的": summary},
+    }
+
+
+RESULTS = [
+    {
+        "title": "search a",
+        "keywords": ["k1"],
+        "search_period": "2025-01-01-2025-01-07",
+        "paper_count": 2,
+        "papers": [make_paper("1"), make_paper("2")],
+    },
+    {
+        # 同じ PMID で内容の異なる論文はブロックに直接入れる
+        "title": "search b",
+        "keywords": ["k2"],
+        "search_period": "2025-01-01-2025-01-07",
+        "paper_count": 2,
+        "papers": [make_paper("2"), make_paper("1", summary="別の要約")],
+    },
+    {"error": "search c: keywords がありません。"},
+    {"title": "search d", "keywords": ["k3"], "search_period": "2025-01-01-2025-01-07", "paper_count": 0, "papers": []},
+]
+
+
+def test_round_trip_compressed(tmp_path):
+    path = archive_path(tmp_path, "2025-01-01-2025-01-07")
+    write_archive(path, RESULTS)
+
+    assert read_archive(path) == RESULTS
+    assert not path.with_name(path.name + ".tmp").exists()
+
+
+def test_compressed_records_share_papers(tmp_path):
+    path = archive_path(tmp_path, "2025-01-01-2025-01-07")
+    write_archive(path, RESULTS)
+
+    records = [json.loads(line) for line in gzip.decompress(path.read_bytes()).decode("utf-8").splitlines()]
+    assert records[0] == {"type": "archive", "version": 1}
+    assert [record["paper"]["pmid"] for record in records if record["type"] == "paper"] == ["1", "2"]
+
+    searches = [record for record in records if record["type"] == "search"]
+    assert searches[0]["papers"] == ["1", "2"]
+    assert searches[1]["papers"][0] == "2"
+    assert searches[1]["papers"][1] == make_paper("1", summary="別の要約")
+    assert searches[2]["papers"] is None
+    assert "papers" not in read_archive(path)[2]
+
+
+def test_round_trip_legacy_json(tmp_path):
+    path = tmp_path / "2025-01-01-2025-01-07.json"
+    write_archive(path, RESULTS)
+
+    assert read_archive(path) == RESULTS
+    assert json.loads(path.read_text(encoding="utf-8")) == RESULTS
+
+
+def test_read_archive_rejects_newer_version(tmp_path):
+    path = archive_path(tmp_path, "2025-01-01-2025-01-07")
+    path.write_bytes(gzip.compress(b'{"type": "archive", "version": 999}\n'))
+
+    with pytest.raises(ValueError):
+        read_archive(path)
+
+
+def test_iter_archive_paths_prefers_compressed(tmp_path):
+    for name in ["2025-01-01-2025-01-07.json", "2025-01-01-2025-01-07.jsonl.gz", "2025-01-08-2025-01-14.json", "notes.txt"]:
+        (tmp_path / name).write_text("", encoding="utf-8")
+
+    assert [path.name for path in iter_archive_paths(tmp_path)] == [
+        "2025-01-01-2025-01-07.jsonl.gz",
+        "2025-01-08-2025-01-14.json",
+    ]
+    assert [path.name for path in iter_archive_paths(tmp_path, unique=False)] == [
+        "2025-01-01-2025-01-07.json",
+        "2025-01-01-2025-01-07.jsonl.gz",
+        "2025-01-08-2025-01-14.json",
+    ]
@@ -0,0 +1,69 @@
+# test_run_journal.py
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from modules.run_journal import RunJournal
+
+
+def make_paper(pmid, summary=None):
+    return {"pmid": pmid, "title": f"title {pmid}", "summary": summary or {"目的": "p"}}
+
+
+def test_resume_restores_searches_and_papers(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = RunJournal.start("2025/01/01", "2025/01/07", path=path)
+    journal.record_search("search a", ["k1", "k2"], ["1", "2", "3"])
+    journal.record_papers([make_paper("1"), make_paper("2", {"error": True, "deferred": True})])
+
+    resumed = RunJournal.resume(path)
+
+    assert (resumed.mindate, resumed.maxdate) == ("2025/01/01", "2025/01/07")
+    assert resumed.search_pmids("search a", ["k1", "k2"]) == ["1", "2", "3"]
+    assert resumed.search_pmids("search a", ["k1"]) is None
+    assert resumed.is_done("1")
+    # エラーの要約と未記録の論文は再開時に要約し直す
+    assert not resumed.is_done("2")
+    assert not resumed.is_done("3")
+
+
+def test_later_record_of_same_paper_wins(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = RunJournal.start("2025/01/01", "2025/01/07", path=path)
+    journal.record_papers([make_paper("1", {"error": True})])
+    journal.record_papers([make_paper("1", {"目的": "retried"})])
+
+    resumed = RunJournal.resume(path)
+
+    assert resumed.is_done("1")
+    assert resumed.papers()["1"]["summary"] == {"目的": "retried"}
+
+
+def test_torn_last_line_is_skipped(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = RunJournal.start("2025/01/01", "2025/01/07", path=path)
+    journal.record_papers([make_paper("1")])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"type": "paper", "paper": {"pmid": "2", "ti')
+
+    resumed = RunJournal.resume(path)
+
+    assert resumed.is_done("1")
+    assert not resumed.is_done("2")
+
+
+def test_completed_or_missing_journal_is_not_resumed(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    assert RunJournal.resume(path) is None
+
+    journal = RunJournal.start("2025/01/01", "2025/01/07", path=path)
+    journal.record_papers([make_paper("1")])
+    journal.mark_complete()
+    assert RunJournal.resume(path) is None
+
+    # 新しい実行を始めると前回の記録は破棄される
+    journal = RunJournal.start("2025/01/08", "2025/01/14", path=path)
+    resumed = RunJournal.resume(path)
+    assert resumed.mindate == "2025/01/08"
+    assert resumed.papers() == {}
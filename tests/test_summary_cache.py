@@ -0,0 +1,72 @@
+# test_summary_cache.py
+import sys
+import json
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+import modules.summary_cache as summary_cache
+from modules.summary_cache import SummaryCache
+
+SUMMARY = {"目的": "p", "サンプル": "s", "解析手法": "m", "結果": "r", "結論": "c"}
+
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_save_appends_only_new_entries_and_touches(tmp_path):
+    path = tmp_path / "summaries.jsonl"
+    cache = SummaryCache(path=path)
+    cache.put("a", "template", "model", SUMMARY)
+    cache.put("b", "template", "model", {**SUMMARY, "目的": "other"})
+    cache.save()
+    assert len(read_lines(path)) == 2
+
+    cache.save()  # 変更が無ければ追記しない
+    assert len(read_lines(path)) == 2
+
+    reloaded = SummaryCache(path=path)
+    assert reloaded.get("a", "template", "model") == SUMMARY
+    assert reloaded.get("a", "other template", "model") is None
+    reloaded.save()
+
+    lines = read_lines(path)
+    assert len(lines) == 3
+    assert set(lines[-1]) == {"key", "last_used"}
+    assert reloaded.stats()["hits"] == 1 and reloaded.stats()["misses"] == 1
+
+
+def test_error_summaries_are_not_cached(tmp_path):
+    cache = SummaryCache(path=tmp_path / "summaries.jsonl")
+    cache.put("a", "template", "model", {"error": True, "message": "failed"})
+    cache.put("b", "template", "model", "No abstract exists.")
+
+    assert cache.stats()["entries"] == 0
+
+
+def test_torn_last_line_is_skipped(tmp_path):
+    path = tmp_path / "summaries.jsonl"
+    cache = SummaryCache(path=path)
+    cache.put("a", "template", "model", SUMMARY)
+    cache.save()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"key": "broken", "summ')
+
+    assert SummaryCache(path=path).get("a", "template", "model") == SUMMARY
+
+
+def test_evicts_least_recently_used(tmp_path, monkeypatch):
+    ticks = iter(range(1, 100))
+    monkeypatch.setattr(summary_cache.time, "time", lambda: next(ticks))
+    path = tmp_path / "summaries.jsonl"
+    size = len(json.dumps(SUMMARY, ensure_ascii=False).encode("utf-8"))
+    cache = SummaryCache(path=path, max_bytes=size * 2)
+    cache.put("a", "template", "model", SUMMARY)
+    cache.put("b", "template", "model", SUMMARY)
+    cache.get("a", "template", "model")
+    cache.put("c", "template", "model", SUMMARY)
+
+    assert cache.get("b", "template", "model") is None
+    assert cache.get("a", "template", "model") == SUMMARY
+    assert cache.get("c", "template", "model") == SUMMARY